@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the GameMaster Console Client
+
+Runs the client against fake_server.py on loopback only, so results are
+reproducible and do not depend on a running game or the office network.
+
+Usage:
+    python benchmark_client.py                         # Run all benchmarks
+    python benchmark_client.py --only dedup --responders 500
+    python benchmark_client.py --only startup
+"""
+
+import argparse
+import asyncio
+import os
+import py_compile
+import queue
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+import requests
+
+from fake_server import FakeGameMasterServer, FakeSsdpResponder, build_noise_response, build_search_response
+from gamemaster_client import GameMasterClient, LoadGenerator, SSDPClient, _SSDPDiscoveryProtocol
+
+
+CLIENT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Modules a one-shot command must not load, gamemaster_client imports them on first use
+HEAVY_MODULES = ('requests', 'urllib3', 'asyncio', 'xml.etree.ElementTree')
+# Allowed time on top of a bare interpreter start for a one-shot command with --server
+STARTUP_BUDGET_MS = 100.0
+
+
+def loopback_ssdp_client(ssdp_port: int, **kwargs) -> SSDPClient:
+    """SSDP client sending unicast M-SEARCH to a fake responder instead of the multicast group"""
+    client = SSDPClient(**kwargs)
+    client.MULTICAST_GROUP = '127.0.0.1'
+    client.MULTICAST_PORT = ssdp_port
+    return client
+
+
+def print_row(name: str, values: List[float], unit: str = 'ms'):
+    print(f"  {name:<38} min {min(values):>9.2f} {unit}   median {statistics.median(values):>9.2f} {unit}")
+
+
+def time_process(args: List[str], rounds: int) -> List[float]:
+    """Wall time of a fresh Python process per round, in milliseconds"""
+    timings = []
+    for _ in range(rounds):
+        start_time = time.perf_counter()
+        subprocess.run(args, cwd=CLIENT_DIR, stdout=subprocess.DEVNULL, check=True)
+        timings.append((time.perf_counter() - start_time) * 1000)
+    return timings
+
+
+def bench_startup(rounds: int) -> bool:
+    """Import time of the client and wall time of a one-shot command, each in a fresh interpreter"""
+    print("\n⚡ Startup")
+    # Measure with byte code cached like on a normal install, even under PYTHONDONTWRITEBYTECODE
+    py_compile.compile(os.path.join(CLIENT_DIR, 'gamemaster_client.py'))
+    check = f"import sys, gamemaster_client; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    loaded = subprocess.run([sys.executable, '-c', check], cwd=CLIENT_DIR, check=True,
+                            stdout=subprocess.PIPE, universal_newlines=True).stdout.split()
+    
+    interpreter = time_process([sys.executable, '-c', 'pass'], rounds)
+    imported = time_process([sys.executable, '-c', 'import gamemaster_client'], rounds)
+    with FakeGameMasterServer() as server:
+        command = ['--no-cache', '--server', f"127.0.0.1:{server.http_port}", 'help']
+        # A script file is compiled on every run, a module comes from the byte code cache
+        as_script = time_process([sys.executable, 'gamemaster_client.py'] + command, rounds)
+        one_shot = time_process([sys.executable, '-m', 'gamemaster_client'] + command, rounds)
+        # How users launch it, the wrapper runs the python on the PATH
+        wrapper = ['cmd', '/c', 'run_client.bat'] if os.name == 'nt' else ['bash', 'run_client.sh']
+        launched = time_process(wrapper + command, rounds)
+    
+    print_row("bare interpreter", interpreter)
+    print_row("import gamemaster_client", imported)
+    print_row("one-shot, python gamemaster_client.py", as_script)
+    print_row("one-shot, python -m gamemaster_client", one_shot)
+    print_row(f"one-shot, {' '.join(wrapper)}", launched)
+    
+    within_budget = not loaded
+    for name, timings in (("one-shot", one_shot), ("wrapper one-shot", launched)):
+        overhead = statistics.median(timings) - statistics.median(interpreter)
+        status = "✅" if overhead < STARTUP_BUDGET_MS else "❌"
+        print(f"  {status} {name} overhead {overhead:.1f} ms (budget {STARTUP_BUDGET_MS:.0f} ms)")
+        within_budget = within_budget and overhead < STARTUP_BUDGET_MS
+    if loaded:
+        print(f"  ❌ importing gamemaster_client loads {', '.join(loaded)}")
+    
+    # Slowest imports, to see what to make lazy next
+    importtime = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import gamemaster_client'],
+                                cwd=CLIENT_DIR, check=True, stderr=subprocess.PIPE, universal_newlines=True).stderr
+    imports = []
+    for line in importtime.splitlines()[1:]:
+        _, cumulative, name = line.split('|')
+        if name.strip() == 'site':
+            # Everything before belongs to interpreter startup
+            imports.clear()
+        elif name.strip() != 'gamemaster_client':
+            imports.append((int(cumulative), name.strip()))
+    for cumulative, name in sorted(imports, reverse=True)[:5]:
+        print(f"  {'import ' + name:<38} {cumulative / 1000:>9.2f} ms cumulative")
+    return within_budget
+
+
+def bench_discovery(rounds: int):
+    """Time until the first server is known, with and without fetching its description"""
+    print("\n🔍 Discovery time-to-first-server")
+    with FakeGameMasterServer() as server:
+        first_yield = []
+        first_described = []
+        for _ in range(rounds):
+            ssdp = loopback_ssdp_client(server.ssdp_port)
+            
+            async def first_server():
+                servers = ssdp.iter_servers_async(search_time=5.0)
+                try:
+                    async for server_info in servers:
+                        return server_info
+                finally:
+                    await servers.aclose()
+            
+            start_time = time.perf_counter()
+            asyncio.run(first_server())
+            first_yield.append((time.perf_counter() - start_time) * 1000)
+            
+            # Fresh client so the description cache does not hide the HTTP fetch
+            ssdp = loopback_ssdp_client(server.ssdp_port)
+            start_time = time.perf_counter()
+            ssdp.discover_servers(search_time=5.0, first_n=1)
+            first_described.append((time.perf_counter() - start_time) * 1000)
+        
+        print_row("iter_servers_async, first yield", first_yield)
+        print_row("discover_servers(first_n=1)", first_described)
+
+
+def bench_dedup(responders: int, interfaces: int, noise: int):
+    """Cost of de-duplicating many servers seen on several interfaces among foreign UPnP replies"""
+    print(f"\n🧮 De-duplication: {responders} servers x {interfaces} interfaces + {noise} foreign replies")
+    
+    advertisements = []
+    for index in range(responders):
+        usn = f"uuid:00000000-0000-0000-0000-{index:012d}::urn:schemas-armor-guild:service:GameMaster:1"
+        locations = [f"http://10.{nic}.{index // 250}.{index % 250 + 1}:54345/description.xml"
+                     for nic in range(interfaces)]
+        advertisements.append((usn, locations, f"LAB-PC-{index:03d}"))
+    
+    # Per-datagram cost of the listener, without the network in the way
+    datagrams = [build_noise_response(index).encode('utf-8') for index in range(noise)]
+    for usn, locations, computer_name in advertisements:
+        for location in locations:
+            datagrams.append(build_search_response(usn, location, computer_name).encode('utf-8'))
+    
+    ssdp = SSDPClient()
+    received = queue.SimpleQueue()
+    protocol = _SSDPDiscoveryProtocol(ssdp, received)
+    start_time = time.perf_counter()
+    for data in datagrams:
+        protocol.datagram_received(data, ('127.0.0.1', 1900))
+        while not received.empty():
+            ssdp._add_discovered_server(received.get())
+    per_datagram = (time.perf_counter() - start_time) / len(datagrams) * 1e6
+    print(f"  {'listener cost per datagram':<38} {per_datagram:>9.2f} us ({len(ssdp.discovered_servers)} unique)")
+    
+    # End to end over loopback UDP
+    responder = FakeSsdpResponder(noise_responses=noise)
+    for usn, locations, computer_name in advertisements:
+        responder.advertise(usn, locations, computer_name)
+    responder.start()
+    try:
+        ssdp = loopback_ssdp_client(responder.port)
+        
+        async def all_servers():
+            found = 0
+            servers = ssdp.iter_servers_async(search_time=10.0)
+            try:
+                async for _ in servers:
+                    found += 1
+                    if found >= responders:
+                        break
+            finally:
+                await servers.aclose()
+            return found
+        
+        start_time = time.perf_counter()
+        found = asyncio.run(all_servers())
+        elapsed = (time.perf_counter() - start_time) * 1000
+        merged = sum(len(server['all_ips']) for server in ssdp.discovered_servers.servers())
+        print(f"  {'time to find all servers (loopback)':<38} {elapsed:>9.2f} ms "
+              f"({found} servers, {merged} interfaces merged)")
+    finally:
+        responder.stop()
+
+
+def bench_commands(duration: float, windows: List[int], latency: float):
+    """Command throughput over pooled keep-alive connections, the command stream and a new connection per command"""
+    print(f"\n🚀 Command throughput ({duration:g}s per row, {latency * 1000:g} ms handler latency)")
+    with FakeGameMasterServer(latency=latency) as server:
+        address = {'ip': '127.0.0.1', 'port': server.http_port}
+        url = f"http://127.0.0.1:{server.http_port}/command"
+        
+        # Baseline: what the client did before connection pooling
+        count = 0
+        start_time = time.perf_counter()
+        while time.perf_counter() - start_time < duration:
+            requests.post(url, json={'Command': 'help', 'Arguments': {}}, timeout=10)
+            count += 1
+        print(f"  {'new connection per command':<38} {count / (time.perf_counter() - start_time):>9.1f} cmd/s")
+        
+        for use_stream in (False, True):
+            transport = 'stream' if use_stream else 'pooled'
+            for window in windows:
+                client = GameMasterClient(pool_size=window, use_stream=use_stream)
+                generator = LoadGenerator(client, address, [('help', [], 1.0)])
+                stats = generator.run_step(duration, concurrency=window)
+                client.sessions.close()
+                client.streams.close()
+                print(f"  {f'{transport}, {window} in flight':<38} {stats['throughput']:>9.1f} cmd/s   "
+                      f"p50 {stats['p50'] * 1000:.2f} ms   p99 {stats['p99'] * 1000:.2f} ms   "
+                      f"errors {stats['errors']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GameMaster client benchmarks on loopback")
+    parser.add_argument('--only', choices=['startup', 'discovery', 'dedup', 'commands'],
+                        help="Run a single benchmark")
+    parser.add_argument('--rounds', type=int, default=5, help="Startup and discovery rounds (default: 5)")
+    parser.add_argument('--responders', type=int, default=300, help="Fake servers for dedup (default: 300)")
+    parser.add_argument('--interfaces', type=int, default=3, help="Interfaces per fake server (default: 3)")
+    parser.add_argument('--noise', type=int, default=200, help="Foreign UPnP replies per search (default: 200)")
+    parser.add_argument('--duration', type=float, default=3.0, help="Seconds per throughput row (default: 3)")
+    parser.add_argument('--windows', type=int, nargs='+', default=[1, 8, 32],
+                        help="Commands in flight per throughput row (default: 1 8 32)")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Fake handler latency (default: 0)")
+    args = parser.parse_args()
+    
+    print("⏱️  GameMaster client benchmarks (loopback)")
+    print("=" * 50)
+    within_budget = True
+    if args.only in (None, 'startup'):
+        within_budget = bench_startup(args.rounds)
+    if args.only in (None, 'discovery'):
+        bench_discovery(args.rounds)
+    if args.only in (None, 'dedup'):
+        bench_dedup(args.responders, args.interfaces, args.noise)
+    if args.only in (None, 'commands'):
+        bench_commands(args.duration, args.windows, args.latency_ms / 1000.0)
+    
+    # Startup regressions fail the run, so they are caught when the benchmark is scripted
+    sys.exit(0 if within_budget else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+"""
+Fake GameMaster Server
+
+An in-process stand-in for GameMasterServer.cs, GameMasterSsdpServer.cs and
+GameMasterStreamServer.cs that answers M-SEARCH requests, sends NOTIFY announcements,
+serves `/`, `/description.xml` and `/command` and accepts framed commands on the
+stream port like the Unity build does. Latency and failures
+can be injected, so client behaviour can be measured without a running game.
+
+Usage:
+    python fake_server.py [--http-port 54345] [--ssdp-port 1900] [--stream-port 54346] [--latency-ms 5] [--failure-rate 0.1]
+"""
+
+import argparse
+import json
+import random
+import socket
+import struct
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+SERVICE_TYPE = 'urn:schemas-armor-guild:service:GameMaster:1'
+MULTICAST_GROUP = '239.255.255.250'
+
+# Length prefix of every frame on the command stream, like GameMasterStreamServer
+STREAM_HEADER = struct.Struct('>I')
+
+# Handler gets the numbered arguments and returns (result message, extra result data)
+CommandHandler = Callable[[Dict[str, str]], Tuple[str, Dict[str, object]]]
+
+
+class FakeSsdpResponder:
+    """Answers M-SEARCH requests for any number of fake GameMaster servers from one UDP socket"""
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, join_multicast: bool = False,
+                 response_delay: float = 0.0, noise_responses: int = 0):
+        self.host = host
+        self.port = port
+        self.join_multicast = join_multicast
+        self.response_delay = response_delay
+        # Unrelated UPnP replies sent along with every answer, like routers and TVs answering ssdp:all
+        self.noise_responses = noise_responses
+        # (usn, location, computer name) of every advertised server interface
+        self.advertisements: List[Tuple[str, str, str]] = []
+        self.searches_received = 0
+        
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+    
+    def advertise(self, usn: str, locations: List[str], computer_name: str):
+        """Answer searches for a server reachable at the given description URLs"""
+        for location in locations:
+            self.advertisements.append((usn, location, computer_name))
+    
+    def start(self):
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(('' if self.join_multicast else self.host, self.port))
+        self.port = self._sock.getsockname()[1]
+        
+        if self.join_multicast:
+            membership = struct.pack('4sl', socket.inet_aton(MULTICAST_GROUP), socket.INADDR_ANY)
+            self._sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        
+        self._sock.settimeout(0.5)
+        self._running = True
+        self._thread = threading.Thread(target=self._listen, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+    
+    def send_notify(self, alive: bool, target: Tuple[str, int]):
+        """Send ssdp:alive or ssdp:byebye for every advertisement to the target address"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            for usn, location, computer_name in self.advertisements:
+                message = build_notify(usn, location, computer_name) if alive else build_byebye(usn)
+                sock.sendto(message.encode('utf-8'), target)
+        finally:
+            sock.close()
+    
+    def _listen(self):
+        while self._running:
+            try:
+                data, addr = self._sock.recvfrom(2048)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            
+            message = data.decode('utf-8', errors='ignore')
+            if message.startswith('M-SEARCH') and self._should_respond(message):
+                self.searches_received += 1
+                if self.response_delay:
+                    time.sleep(self.response_delay)
+                self._respond(addr)
+    
+    @staticmethod
+    def _should_respond(message: str) -> bool:
+        """Same rule as GameMasterSsdpServer.ShouldRespondToMSearch"""
+        for line in message.split('\n'):
+            if line.upper().startswith('ST:'):
+                search_target = line[3:].strip().lower()
+                return search_target in (SERVICE_TYPE.lower(), 'ssdp:all')
+        return False
+    
+    def _respond(self, addr: Tuple[str, int]):
+        try:
+            for index in range(self.noise_responses):
+                self._sock.sendto(build_noise_response(index).encode('utf-8'), addr)
+            for usn, location, computer_name in self.advertisements:
+                self._sock.sendto(build_search_response(usn, location, computer_name).encode('utf-8'), addr)
+        except OSError:
+            pass
+
+
+class FakeGameMasterServer:
+    """Stand-in GameMaster server: HTTP command endpoint plus SSDP advertisement"""
+    
+    def __init__(self, host: str = '127.0.0.1', http_port: int = 0, ssdp_port: int = 0,
+                 computer_name: str = 'FakeGameMaster', latency: float = 0.0, failure_rate: float = 0.0,
+                 interfaces: Optional[List[str]] = None, join_multicast: bool = False,
+                 stream_port: Optional[int] = 0):
+        self.host = host
+        self.computer_name = computer_name
+        # Artificial time spent in every command handler, in seconds
+        self.latency = latency
+        # Share of commands answered with HTTP 500
+        self.failure_rate = failure_rate
+        # Addresses announced in LOCATION headers, like one per network interface
+        self.interfaces = interfaces or [host]
+        self.usn = f"uuid:{uuid.uuid4()}::{SERVICE_TYPE}"
+        self.commands_received = 0
+        
+        # lower-cased name -> (description, handler), original names kept for help and status
+        self._commands: Dict[str, Tuple[str, CommandHandler]] = {}
+        self._command_names: Dict[str, str] = {}
+        self._instance_id = uuid.uuid4().hex
+        self._commands_revision = 0
+        # Commands run one at a time, like on the Unity main thread
+        self._main_thread = threading.Lock()
+        self._http = ThreadingHTTPServer((host, http_port), self._make_handler())
+        self._http.daemon_threads = True
+        self._http_thread: Optional[threading.Thread] = None
+        # Open keep-alive connections, dropped on stop() like HttpListener.Stop does
+        self._http_clients: List[socket.socket] = []
+        self.ssdp = FakeSsdpResponder(host, ssdp_port, join_multicast)
+        # None disables the command stream, like an older build or StartServer(enableStream: false)
+        self._stream: Optional[socket.socket] = None
+        if stream_port is not None:
+            self._stream = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._stream.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._stream.bind((host, stream_port))
+        self._stream_thread: Optional[threading.Thread] = None
+        self._stream_clients: List[socket.socket] = []
+        self.stream_connections = 0
+        
+        self.register_command('help', "Shows all comands", self._handle_help)
+        self.register_command('SetGameSpeed', "Sets game speed multiplier", self._handle_set_game_speed)
+    
+    @property
+    def http_port(self) -> int:
+        return self._http.server_address[1]
+    
+    @property
+    def ssdp_port(self) -> int:
+        return self.ssdp.port
+    
+    @property
+    def stream_port(self) -> Optional[int]:
+        return self._stream.getsockname()[1] if self._stream else None
+    
+    def register_command(self, command: str, description: str, handler: CommandHandler):
+        """Register a command, names are case-insensitive like on the real server"""
+        self._commands[command.lower()] = (description, handler)
+        self._command_names[command.lower()] = command
+        self._commands_revision += 1
+    
+    def unregister_command(self, command: str) -> bool:
+        """Remove a command, returns False if it was not registered"""
+        if self._commands.pop(command.lower(), None) is None:
+            return False
+        del self._command_names[command.lower()]
+        self._commands_revision += 1
+        return True
+    
+    @property
+    def commands_version(self) -> str:
+        """Changes whenever commands are (un)registered, like GameMasterServer.GetCommandsVersion"""
+        return f"{self._instance_id}.{self._commands_revision}"
+    
+    def start(self) -> 'FakeGameMasterServer':
+        self._http_thread = threading.Thread(target=self._http.serve_forever, daemon=True)
+        self._http_thread.start()
+        if self._stream:
+            self._stream.listen(16)
+            self._stream_thread = threading.Thread(target=self._accept_stream_clients, daemon=True)
+            self._stream_thread.start()
+        
+        locations = [f"http://{ip}:{self.http_port}/description.xml" for ip in self.interfaces]
+        self.ssdp.advertise(self.usn, locations, self.computer_name)
+        self.ssdp.start()
+        return self
+    
+    def stop(self):
+        self.ssdp.stop()
+        self._http.shutdown()
+        self._http.server_close()
+        if self._http_thread is not None:
+            self._http_thread.join(timeout=2.0)
+            self._http_thread = None
+        # shutdown() only stops accepting, handler threads would keep answering on open connections
+        for connection in list(self._http_clients):
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._stream:
+            # Unblocks accept(), connection threads end when their clients see the close
+            try:
+                self._stream.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._stream.close()
+            # Like cancelling GameMasterStreamServer, which closes every client
+            for connection in list(self._stream_clients):
+                try:
+                    connection.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+            if self._stream_thread is not None:
+                self._stream_thread.join(timeout=2.0)
+                self._stream_thread = None
+    
+    def __enter__(self) -> 'FakeGameMasterServer':
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.stop()
+    
+    def execute_command(self, command: str, arguments: Dict[str, str]) -> Dict[str, object]:
+        """Build the same result structure as GameMasterServer.ExecuteCommand"""
+        timestamp = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        entry = self._commands.get(command.lower())
+        if entry is None:
+            return {
+                'Success': False,
+                'Message': f"Command '{command}' is not registered",
+                'Data': {'command': command, 'arguments': arguments, 'timestamp': timestamp,
+                         'status': 'failed', 'error': 'Command not found'}
+            }
+        
+        if self.latency:
+            time.sleep(self.latency)
+        
+        try:
+            message, data = entry[1](arguments)
+        except Exception as e:
+            return {
+                'Success': False,
+                'Message': f"Error executing command '{command}': {e}",
+                'Data': {'command': command, 'arguments': arguments, 'timestamp': timestamp,
+                         'status': 'error', 'error': repr(e)}
+            }
+        
+        result_data = {'command': command, 'arguments': arguments, 'timestamp': timestamp, 'status': 'completed'}
+        result_data.update(data)
+        return {
+            'Success': True,
+            'Message': message or f"Command '{command}' executed successfully",
+            'Data': result_data
+        }
+    
+    def run_command(self, command: str, arguments: Dict[str, str],
+                    received_at: float) -> Tuple[Optional[Dict[str, object]], float, float]:
+        """Execute on the fake main thread, returns (result or None for an injected failure, queue ms, execute ms)"""
+        with self._main_thread:
+            dispatched_at = time.perf_counter()
+            self.commands_received += 1
+            if self.failure_rate and random.random() < self.failure_rate:
+                return None, (dispatched_at - received_at) * 1000, 0.0
+            result = self.execute_command(command, arguments)
+            executed_at = time.perf_counter()
+        return result, (dispatched_at - received_at) * 1000, (executed_at - dispatched_at) * 1000
+    
+    def _accept_stream_clients(self):
+        while True:
+            try:
+                connection, _ = self._stream.accept()
+            except OSError:
+                # Listening socket closed by stop()
+                return
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._stream_clients.append(connection)
+            self.stream_connections += 1
+            threading.Thread(target=self._serve_stream_client, args=(connection,), daemon=True).start()
+    
+    def _serve_stream_client(self, connection: socket.socket):
+        """Answer frames in the order they arrive, like commands queued for the Unity main thread"""
+        reader = connection.makefile('rb')
+        try:
+            while True:
+                header = reader.read(STREAM_HEADER.size)
+                if len(header) < STREAM_HEADER.size:
+                    return
+                body = reader.read(STREAM_HEADER.unpack(header)[0])
+                received_at = time.perf_counter()
+                
+                try:
+                    request = json.loads(body.decode('utf-8'))
+                except ValueError as e:
+                    self._send_frame(connection, {'Id': None, 'Error': f"Invalid JSON: {e}"})
+                    continue
+                if not request.get('Command'):
+                    self._send_frame(connection, {'Id': request.get('Id'), 'Error': "Command is required"})
+                    continue
+                
+                result, queue_ms, execute_ms = self.run_command(request['Command'], request.get('Arguments') or {},
+                                                                received_at)
+                if result is None:
+                    response = {'Id': request.get('Id'), 'Error': "Command execution failed: injected failure"}
+                else:
+                    # Id first like the anonymous object GameMasterServer replies with
+                    response = dict({'Id': request.get('Id')}, **result, QueueMs=round(queue_ms, 3),
+                                    ExecuteMs=round(execute_ms, 3), CommandsVersion=self.commands_version)
+                self._send_frame(connection, response)
+        except OSError:
+            pass
+        finally:
+            self._stream_clients.remove(connection)
+            reader.close()
+            connection.close()
+    
+    @staticmethod
+    def _send_frame(connection: socket.socket, message: Dict[str, object]):
+        body = json.dumps(message).encode('utf-8')
+        connection.sendall(STREAM_HEADER.pack(len(body)) + body)
+    
+    def status(self) -> Dict[str, object]:
+        return {
+            'Status': 'Running',
+            'Port': self.http_port,
+            'Timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'RegisteredCommands': list(self._command_names.values()),
+            'Commands': {self._command_names[key]: desc for key, (desc, _) in self._commands.items()},
+            'CommandsVersion': self.commands_version,
+            'StreamPort': self.stream_port,
+            'Endpoints': [
+                "GET / - Server status",
+                "POST /command - Execute command",
+                "GET /description.xml - Service description (UPnP)",
+                "TCP StreamPort - Execute commands over length-prefixed JSON frames"
+            ]
+        }
+    
+    def description(self) -> str:
+        return (
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<root xmlns="urn:schemas-upnp-org:device-1-0">\n'
+            '    <specVersion><major>1</major><minor>0</minor></specVersion>\n'
+            '    <device>\n'
+            '        <deviceType>urn:schemas-armor-guild:device:GameMasterConsole:1</deviceType>\n'
+            f'        <friendlyName>Fake Game Master Console ({self.computer_name})</friendlyName>\n'
+            '        <modelName>FakeGameMaster</modelName>\n'
+            f'        <UDN>uuid:{uuid.uuid4()}</UDN>\n'
+            f'        <presentationURL>http://{self.host}:{self.http_port}/</presentationURL>\n'
+            '    </device>\n'
+            '</root>'
+        )
+    
+    def _handle_help(self, arguments: Dict[str, str]) -> Tuple[str, Dict[str, object]]:
+        lines = [f"{self._command_names[key]} - {desc}" for key, (desc, _) in self._commands.items()]
+        return "List of commands:\n" + "\n".join(lines), {}
+    
+    @staticmethod
+    def _handle_set_game_speed(arguments: Dict[str, str]) -> Tuple[str, Dict[str, object]]:
+        speed = float(arguments.get('0', '1'))
+        return f"Game speed set to {speed}x", {}
+    
+    def _make_handler(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive like HttpListener, and no Nagle delay on small responses
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+            
+            def setup(self):
+                super().setup()
+                server._http_clients.append(self.connection)
+            
+            def finish(self):
+                try:
+                    super().finish()
+                finally:
+                    server._http_clients.remove(self.connection)
+            
+            def log_message(self, format, *args):
+                pass
+            
+            def _write(self, status: int, body: str, content_type: str = 'text/plain',
+                       headers: Optional[Dict[str, str]] = None):
+                payload = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(payload)))
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.send_header('X-GM-Commands-Version', server.commands_version)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def do_GET(self):
+                if self.path == '/':
+                    self._write(200, json.dumps(server.status(), indent=2), 'application/json')
+                elif self.path == '/description.xml':
+                    self._write(200, server.description(), 'text/xml')
+                else:
+                    self._write(404, "Endpoint not found")
+            
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length).decode('utf-8') if length else ''
+                if self.path != '/command':
+                    self._write(404, "Endpoint not found")
+                    return
+                if not body:
+                    self._write(400, "Request body is required")
+                    return
+                
+                try:
+                    request = json.loads(body)
+                except ValueError as e:
+                    self._write(400, f"Invalid JSON: {e}")
+                    return
+                
+                command = request.get('Command')
+                if not command:
+                    self._write(400, "Command is required")
+                    return
+                
+                result, queue_ms, execute_ms = server.run_command(command, request.get('Arguments') or {},
+                                                                  time.perf_counter())
+                if result is None:
+                    self._write(500, "Command execution failed: injected failure")
+                    return
+                
+                self._write(200, json.dumps(result), 'application/json', {
+                    'X-GM-Queue-Ms': f"{queue_ms:.3f}",
+                    'X-GM-Execute-Ms': f"{execute_ms:.3f}"
+                })
+        
+        return Handler
+
+
+def build_search_response(usn: str, location: str, computer_name: str) -> str:
+    """Same format as GameMasterSsdpServer.BuildSearchResponse"""
+    return (
+        f"HTTP/1.1 200 OK\r\n"
+        f"CACHE-CONTROL: max-age=1800\r\n"
+        f"LOCATION: {location}\r\n"
+        f"SERVER: GameMaster/1.0 ({computer_name})\r\n"
+        f"ST: {SERVICE_TYPE}\r\n"
+        f"USN: {usn}\r\n"
+        f"COMPUTER-NAME: {computer_name}\r\n"
+        f"\r\n"
+    )
+
+
+def build_notify(usn: str, location: str, computer_name: str) -> str:
+    """Same format as GameMasterSsdpServer.BuildNotifyMessage"""
+    return (
+        f"NOTIFY * HTTP/1.1\r\n"
+        f"HOST: {MULTICAST_GROUP}:1900\r\n"
+        f"CACHE-CONTROL: max-age=1800\r\n"
+        f"LOCATION: {location}\r\n"
+        f"NT: {SERVICE_TYPE}\r\n"
+        f"NTS: ssdp:alive\r\n"
+        f"USN: {usn}\r\n"
+        f"SERVER: GameMaster/1.0 ({computer_name})\r\n"
+        f"COMPUTER-NAME: {computer_name}\r\n"
+        f"\r\n"
+    )
+
+
+def build_byebye(usn: str) -> str:
+    """Same format as GameMasterSsdpServer.BuildByebyeMessage"""
+    return (
+        f"NOTIFY * HTTP/1.1\r\n"
+        f"HOST: {MULTICAST_GROUP}:1900\r\n"
+        f"NT: {SERVICE_TYPE}\r\n"
+        f"NTS: ssdp:byebye\r\n"
+        f"USN: {usn}\r\n"
+        f"\r\n"
+    )
+
+
+def build_noise_response(index: int) -> str:
+    """A reply from some unrelated UPnP device"""
+    return (
+        f"HTTP/1.1 200 OK\r\n"
+        f"CACHE-CONTROL: max-age=120\r\n"
+        f"LOCATION: http://10.0.{index // 250 % 250}.{index % 250 + 1}:49152/rootDesc.xml\r\n"
+        f"SERVER: Linux/5.4 UPnP/1.0 MiniUPnPd/2.2\r\n"
+        f"ST: upnp:rootdevice\r\n"
+        f"USN: uuid:{uuid.UUID(int=index)}::upnp:rootdevice\r\n"
+        f"\r\n"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake GameMaster server for local testing")
+    parser.add_argument('--host', default='127.0.0.1', help="Address to serve HTTP on (default: 127.0.0.1)")
+    parser.add_argument('--http-port', type=int, default=54345, help="HTTP port (default: 54345)")
+    parser.add_argument('--ssdp-port', type=int, default=1900, help="SSDP port (default: 1900)")
+    parser.add_argument('--no-multicast', action='store_true',
+                        help="Only answer unicast M-SEARCH, do not join the SSDP multicast group")
+    parser.add_argument('--name', default=socket.gethostname(), help="Computer name to advertise")
+    parser.add_argument('--stream-port', type=int, default=None,
+                        help="Command stream port (default: HTTP port + 1, like the game)")
+    parser.add_argument('--no-stream', action='store_true',
+                        help="Do not accept commands over the stream, like an older build")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Artificial command handler time")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="Share of commands failing with HTTP 500")
+    args = parser.parse_args()
+    
+    server = FakeGameMasterServer(args.host, args.http_port, args.ssdp_port, args.name,
+                                  args.latency_ms / 1000.0, args.failure_rate,
+                                  join_multicast=not args.no_multicast,
+                                  stream_port=None if args.no_stream else (args.stream_port or args.http_port + 1))
+    server.start()
+    if not args.no_multicast:
+        server.ssdp.send_notify(True, (MULTICAST_GROUP, args.ssdp_port))
+    
+    print(f"🎭 Fake GameMaster server '{args.name}' on http://{args.host}:{server.http_port}/ "
+          f"(SSDP port {server.ssdp_port}, stream port {server.stream_port or 'disabled'})")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if not args.no_multicast:
+            server.ssdp.send_notify(False, (MULTICAST_GROUP, args.ssdp_port))
+        server.stop()
+        print("👋 Fake server stopped")
+
+
+if __name__ == "__main__":
+    main()
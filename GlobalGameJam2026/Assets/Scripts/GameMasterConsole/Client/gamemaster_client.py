@@ -6,30 +6,193 @@ A Python console application that discovers GameMaster servers via SSDP protocol
 and allows sending commands to them.
 
 Usage:
-    python gamemaster_client.py
+    python gamemaster_client.py [--pool-size N] [--retries N] [--backoff SECONDS]
+                                [--quiet-period SECONDS] [--first N] [--registry]
+                                [--no-ssdp-all]
+    python gamemaster_client.py --server HOST[:PORT] <COMMAND> <ARG1> ...
+    python gamemaster_client.py --monitor [--target NAME]
 
 Commands:
     EXIT - Close the application
     RESTART - Restart server discovery
+    STATS - Show connection reuse and latency statistics
+    BROADCAST <COMMAND> <ARG1> ... - Send command to all discovered servers
     <COMMAND> <ARG1> <ARG2> ... - Send command to GameMaster server
 """
 
+# Type hints stay unevaluated, so they can name modules that are only imported on first use
+from __future__ import annotations
+
+# requests, asyncio, xml and readline are imported where they are used: a one-shot
+# command with --server never needs them, and they dominate startup time
+import bisect
+import codecs
+import collections
+import concurrent.futures
+import fnmatch
+import ipaddress
+import itertools
 import socket
 import struct
 import threading
 import time
 import json
-import requests
+import math
+import os
+import queue
+import random
+import argparse
 import urllib.parse
-from typing import List, Dict, Optional, Tuple
-import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, List, Dict, Optional, Tuple, Union
 import re
 import sys
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
+# Retries are reported by the client itself, keep urllib3 quiet
+logging.getLogger('urllib3').setLevel(logging.ERROR)
+
+# Port GameMasterServer.StartServer listens on by default
+DEFAULT_SERVER_PORT = 54345
+# Last known servers, see ServerCache
+DEFAULT_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.gamemaster_client', 'servers.json')
+# run_client.sh and run_client.bat install requirements.txt and start again on this exit code
+MISSING_DEPENDENCY_EXIT_CODE = 3
+
+
+def local_ipv4_interfaces() -> List[Tuple[str, str]]:
+    """Get (interface name, IPv4 address) of the local network interfaces that have one"""
+    interfaces = []
+    try:
+        import fcntl
+        # SIOCGIFADDR, the address sits at the same offset of struct ifreq on Linux and macOS
+        request = 0xc0206921 if sys.platform == 'darwin' else 0x8915
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            for _, name in socket.if_nameindex():
+                try:
+                    ifreq = fcntl.ioctl(sock.fileno(), request, struct.pack('256s', name[:15].encode('utf-8')))
+                    interfaces.append((name, socket.inet_ntoa(ifreq[20:24])))
+                except OSError:
+                    # Down or without an IPv4 address
+                    continue
+    except (ImportError, AttributeError, OSError):
+        # Windows: no ioctl, but the host name resolves to every configured address
+        try:
+            addresses = socket.getaddrinfo(socket.gethostname(), None, socket.AF_INET, socket.SOCK_DGRAM)
+            interfaces = [(address[4][0], address[4][0]) for address in addresses]
+        except OSError as e:
+            logger.debug(f"Cannot list network interfaces: {e}")
+    
+    unique = []
+    seen = set()
+    for name, ip in interfaces:
+        if ip not in seen:
+            seen.add(ip)
+            unique.append((name, ip))
+    return unique
+
+
+class ServerTable:
+    """Thread-safe table of discovered servers indexed by USN and (ip, port)"""
+    
+    def __init__(self):
+        # usn (or "ip:port" for servers without USN) -> server info, in discovery order
+        self._servers: Dict[str, Dict[str, str]] = {}
+        # (ip, port) -> key of the server answering on that interface
+        self._addresses: Dict[Tuple[str, int], str] = {}
+        self._expires_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._servers)
+    
+    @staticmethod
+    def key_for(server_info: Dict[str, str]) -> str:
+        """Get the table key for a server"""
+        return server_info.get('usn', '') or f"{server_info['ip']}:{server_info['port']}"
+    
+    def add(self, server_info: Dict[str, str], expires_at: Optional[float] = None) -> bool:
+        """Add a server or merge another interface of a known one, returns True for new servers"""
+        key = self.key_for(server_info)
+        port = server_info['port']
+        
+        with self._lock:
+            if expires_at is not None:
+                self._expires_at[key] = expires_at
+            
+            server = self._servers.get(key)
+            if server is None:
+                server = {k: v for k, v in server_info.items() if k != 'nts'}
+                server['all_ips'] = []
+                self._servers[key] = server
+                is_new = True
+            else:
+                is_new = False
+            
+            # Same server answering from several network interfaces
+            for ip in server_info.get('all_ips') or [server_info['ip']]:
+                if self._addresses.get((ip, port)) != key:
+                    self._addresses[(ip, port)] = key
+                    if ip not in server['all_ips']:
+                        server['all_ips'].append(ip)
+            
+            return is_new
+    
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        """Get a server by USN (or "ip:port")"""
+        with self._lock:
+            return self._servers.get(key)
+    
+    def get_by_address(self, ip: str, port: int) -> Optional[Dict[str, str]]:
+        """Get the server answering on the given interface"""
+        with self._lock:
+            key = self._addresses.get((ip, port))
+            return self._servers.get(key) if key is not None else None
+    
+    def remove(self, key: str) -> bool:
+        """Remove a server and all of its interfaces"""
+        with self._lock:
+            return self._remove(key)
+    
+    def _remove(self, key: str) -> bool:
+        server = self._servers.pop(key, None)
+        self._expires_at.pop(key, None)
+        if server is None:
+            return False
+        
+        for ip in server['all_ips']:
+            address = (ip, server['port'])
+            if self._addresses.get(address) == key:
+                del self._addresses[address]
+        return True
+    
+    def evict_expired(self, now: Optional[float] = None) -> int:
+        """Remove servers whose expiry time has passed"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            expired = [key for key, expires_at in self._expires_at.items() if expires_at <= now]
+            for key in expired:
+                self._remove(key)
+            return len(expired)
+    
+    def clear(self):
+        """Remove all servers"""
+        with self._lock:
+            self._servers.clear()
+            self._addresses.clear()
+            self._expires_at.clear()
+    
+    def servers(self) -> List[Dict[str, str]]:
+        """Get copies of all servers in discovery order"""
+        with self._lock:
+            result = []
+            for server in self._servers.values():
+                copy = dict(server)
+                copy['all_ips'] = list(server['all_ips'])
+                result.append(copy)
+            return result
+
 
 class SSDPClient:
     """Client for discovering GameMaster servers via SSDP protocol"""
@@ -38,10 +201,31 @@ class SSDPClient:
     MULTICAST_PORT = 1900
     SERVICE_TYPE = 'urn:schemas-armor-guild:service:GameMaster:1'
     
-    def __init__(self, timeout: float = 5.0):
+    RECEIVE_BUFFER_SIZE = 1024 * 1024
+    
+    # Every GameMaster ST, USN or SERVER header contains this marker, see _is_gamemaster_server
+    _GAMEMASTER_MARKER = b'gamemaster'
+    
+    def __init__(self, timeout: float = 5.0, description_workers: int = 8, registry_max_age: float = 90.0,
+                 search_all: bool = True, multicast_ttl: int = 2,
+                 include_interfaces: Optional[List[str]] = None, exclude_interfaces: Optional[List[str]] = None):
         self.timeout = timeout
-        self.discovered_servers = []
-        self.stop_discovery = False
+        self.search_all = search_all
+        # UPnP recommends 2, the OS default of 1 does not cross a single router
+        self.multicast_ttl = multicast_ttl
+        # Name or address patterns of the interfaces to search on, see search_interfaces
+        self.include_interfaces = include_interfaces or []
+        self.exclude_interfaces = exclude_interfaces or []
+        self.description_workers = description_workers
+        self.registry_max_age = registry_max_age
+        self.discovered_servers = ServerTable()
+        # (usn, location) -> (expires_at, description fields)
+        self._description_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, str]]] = {}
+        self._description_cache_lock = threading.Lock()
+        # Servers announced via NOTIFY
+        self._registry = ServerTable()
+        self._registry_thread: Optional[threading.Thread] = None
+        self._registry_stop = threading.Event()
         
     def create_msearch_request(self, search_target: str = None) -> str:
         """Create M-SEARCH request for SSDP discovery"""
@@ -60,42 +244,91 @@ class SSDPClient:
     def parse_ssdp_response(self, response: str) -> Optional[Dict[str, str]]:
         """Parse SSDP response to extract server information"""
         try:
-            lines = response.strip().split('\r\n')
-            if not lines[0].startswith('HTTP/1.1 200'):
+            start_line, headers = self._parse_headers(response)
+            if not start_line.startswith('HTTP/1.1 200'):
                 return None
-                
-            headers = {}
-            for line in lines[1:]:
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    headers[key.strip().upper()] = value.strip()
-                    
-            # Extract location URL
-            location = headers.get('LOCATION')
-            if not location:
+            
+            return self._server_info_from_headers(headers)
+        except Exception as e:
+            logger.debug(f"Error parsing SSDP response: {e}")
+            return None
+    
+    def parse_ssdp_notify(self, message: str) -> Optional[Dict[str, str]]:
+        """Parse SSDP NOTIFY announcement, the result carries its 'nts' value"""
+        try:
+            start_line, headers = self._parse_headers(message)
+            if not start_line.startswith('NOTIFY'):
                 return None
-                
-            # Parse the location URL to get IP and port
-            parsed_url = urllib.parse.urlparse(location)
-            if not parsed_url.hostname:
+            
+            nts = headers.get('NTS', '').lower()
+            if nts == 'ssdp:byebye':
+                # Bye-bye announcements carry no location, the USN is enough to forget the server
+                return {
+                    'nts': nts,
+                    'usn': headers.get('USN', ''),
+                    'st': headers.get('NT', '')
+                }
+            
+            if nts != 'ssdp:alive':
                 return None
-                
-            return {
-                'ip': parsed_url.hostname,
-                'port': parsed_url.port or 80,
-                'location': location,
-                'server': headers.get('SERVER', 'Unknown'),
-                'usn': headers.get('USN', ''),
-                'st': headers.get('ST', ''),
-                'computer_name': headers.get('COMPUTER-NAME', ''),
-                'cache_control': headers.get('CACHE-CONTROL', '')
-            }
+            
+            server_info = self._server_info_from_headers(headers)
+            if server_info:
+                server_info['st'] = headers.get('NT', '')
+                server_info['nts'] = nts
+            return server_info
         except Exception as e:
-            logger.debug(f"Error parsing SSDP response: {e}")
+            logger.debug(f"Error parsing SSDP announcement: {e}")
             return None
     
+    @staticmethod
+    def _parse_headers(message: str) -> Tuple[str, Dict[str, str]]:
+        """Split SSDP message into start line and upper-cased headers"""
+        lines = message.strip().split('\r\n')
+        
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                key, value = line.split(':', 1)
+                headers[key.strip().upper()] = value.strip()
+        
+        return lines[0], headers
+    
+    @staticmethod
+    def _server_info_from_headers(headers: Dict[str, str]) -> Optional[Dict[str, str]]:
+        """Build server information from SSDP headers"""
+        # Extract location URL
+        location = headers.get('LOCATION')
+        if not location:
+            return None
+            
+        # Parse the location URL to get IP and port
+        parsed_url = urllib.parse.urlparse(location)
+        if not parsed_url.hostname:
+            return None
+            
+        return {
+            'ip': parsed_url.hostname,
+            'port': parsed_url.port or 80,
+            'location': location,
+            'server': headers.get('SERVER', 'Unknown'),
+            'usn': headers.get('USN', ''),
+            'st': headers.get('ST', ''),
+            'computer_name': headers.get('COMPUTER-NAME', ''),
+            'cache_control': headers.get('CACHE-CONTROL', '')
+        }
+    
     def get_server_description(self, server_info: Dict[str, str]) -> Optional[Dict[str, str]]:
         """Get server description from the description XML"""
+        cache_key = (server_info.get('usn', ''), server_info['location'])
+        cached = self._get_cached_description(cache_key)
+        if cached is not None:
+            server_info.update(cached)
+            return server_info
+        
+        import requests
+        import xml.etree.ElementTree as ET
+        
         try:
             response = requests.get(server_info['location'], timeout=3)
             if response.status_code == 200:
@@ -108,8 +341,12 @@ class SSDPClient:
                     friendly_name = device.find('.//{urn:schemas-upnp-org:device-1-0}friendlyName')
                     model_name = device.find('.//{urn:schemas-upnp-org:device-1-0}modelName')
                     
-                    server_info['friendly_name'] = friendly_name.text if friendly_name is not None else 'GameMaster Server'
-                    server_info['model_name'] = model_name.text if model_name is not None else 'Unknown'
+                    description = {
+                        'friendly_name': friendly_name.text if friendly_name is not None else 'GameMaster Server',
+                        'model_name': model_name.text if model_name is not None else 'Unknown'
+                    }
+                    server_info.update(description)
+                    self._cache_description(cache_key, description, server_info.get('cache_control', ''))
                     
                 return server_info
         except Exception as e:
@@ -117,111 +354,323 @@ class SSDPClient:
             
         return server_info
     
-    def discover_servers(self, search_time: float = 5.0) -> List[Dict[str, str]]:
+    def _get_cached_description(self, cache_key: Tuple[str, str]) -> Optional[Dict[str, str]]:
+        """Get a cached description if it has not expired yet"""
+        with self._description_cache_lock:
+            entry = self._description_cache.get(cache_key)
+            if entry is None:
+                return None
+            
+            expires_at, description = entry
+            if time.monotonic() >= expires_at:
+                del self._description_cache[cache_key]
+                return None
+            
+            return description
+    
+    def _cache_description(self, cache_key: Tuple[str, str], description: Dict[str, str], cache_control: str):
+        """Cache a description for as long as the server's CACHE-CONTROL allows"""
+        max_age = self._parse_max_age(cache_control)
+        if not max_age:
+            return
+        
+        with self._description_cache_lock:
+            self._description_cache[cache_key] = (time.monotonic() + max_age, description)
+    
+    @staticmethod
+    def _parse_max_age(cache_control: str) -> int:
+        """Extract max-age seconds from a CACHE-CONTROL header value"""
+        match = re.search(r'max-age\s*=\s*(\d+)', cache_control, re.IGNORECASE)
+        return int(match.group(1)) if match else 0
+    
+    def discover_servers(self, search_time: float = 5.0, first_n: Optional[int] = None,
+                         quiet_period: Optional[float] = None) -> List[Dict[str, str]]:
         """Discover GameMaster servers on the network"""
-        self.discovered_servers = []
-        self.stop_discovery = False
+        import asyncio
         
         try:
-            # Create UDP socket
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            return asyncio.run(self.discover_servers_async(search_time, first_n, quiet_period))
+        except Exception as e:
+            logger.error(f"Error during server discovery: {e}")
+            return []
+    
+    async def discover_servers_async(self, search_time: float = 5.0, first_n: Optional[int] = None,
+                                     quiet_period: Optional[float] = None) -> List[Dict[str, str]]:
+        """Discover GameMaster servers, returning as soon as first_n servers are found
+        or no new server has answered for quiet_period seconds"""
+        import asyncio
+        
+        found = []
+        servers = self.iter_servers_async(search_time, quiet_period)
+        try:
+            async for server_info in servers:
+                found.append(server_info)
+                if first_n is not None and len(found) >= first_n:
+                    break
+        finally:
+            await servers.aclose()
+        
+        # Description fetching uses blocking HTTP, keep it off the event loop
+        loop = asyncio.get_running_loop()
+        servers = await loop.run_in_executor(None, self._fetch_descriptions, found)
+        
+        if self.registry_running:
+            for server_info in found:
+                self._update_registry(server_info)
+        
+        return servers
+    
+    async def iter_servers_async(self, search_time: float = 5.0,
+                                 quiet_period: Optional[float] = None) -> AsyncIterator[Dict[str, str]]:
+        """Yield GameMaster servers as their M-SEARCH responses arrive"""
+        import asyncio
+        
+        self.discovered_servers.clear()
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        
+        # One socket per interface, otherwise the OS sends the multicast out of the default one only
+        transports = []
+        for sock in self._create_search_sockets():
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda: _SSDPDiscoveryProtocol(self, queue), sock=sock)
+            transports.append(transport)
+        if not transports:
+            return
+        sender = loop.create_task(self._send_msearch_requests(transports))
+        
+        try:
+            deadline = loop.time() + search_time
+            # Only a new server restarts the quiet period, not repeated answers to the M-SEARCH resends
+            last_new_server = None
+            while True:
+                timeout = deadline - loop.time()
+                if quiet_period is not None and last_new_server is not None:
+                    timeout = min(timeout, last_new_server + quiet_period - loop.time())
+                if timeout <= 0:
+                    break
+                
+                try:
+                    server_info = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                
+                if self._add_discovered_server(server_info):
+                    last_new_server = loop.time()
+                    # Yield the table entry so interfaces merged later show up in all_ips
+                    yield self.discovered_servers.get(ServerTable.key_for(server_info))
+        finally:
+            sender.cancel()
+            for transport in transports:
+                transport.close()
+    
+    def search_interfaces(self) -> List[Tuple[str, str]]:
+        """Get the (name, address) of the interfaces to search on
+        
+        Loopback is skipped unless included explicitly. Patterns match the interface name or
+        address with shell wildcards, e.g. "eth*" or "192.168.*".
+        """
+        def matches(name: str, ip: str, patterns: List[str]) -> bool:
+            return any(fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(ip, pattern) for pattern in patterns)
+        
+        selected = []
+        for name, ip in local_ipv4_interfaces():
+            if self.include_interfaces:
+                if not matches(name, ip, self.include_interfaces):
+                    continue
+            elif ipaddress.ip_address(ip).is_loopback:
+                continue
+            if matches(name, ip, self.exclude_interfaces):
+                continue
+            selected.append((name, ip))
+        return selected
+    
+    def _create_search_sockets(self) -> List[socket.socket]:
+        """UDP sockets to send M-SEARCH from, bound so they can be polled before the first send"""
+        interfaces = []
+        # Interface selection only means something for multicast, not for a unicast search target
+        if ipaddress.ip_address(self.MULTICAST_GROUP).is_multicast:
+            interfaces = self.search_interfaces()
+            if not interfaces and (self.include_interfaces or self.exclude_interfaces):
+                logger.warning("No network interface matches the interface filters, see --list-interfaces")
+                return []
+        
+        sockets = []
+        for name, ip in interfaces:
+            try:
+                sockets.append(self._create_search_socket(ip))
+                logger.debug(f"Searching on {name} ({ip})")
+            except OSError as e:
+                logger.debug(f"Cannot search on {name} ({ip}): {e}")
+        if not sockets:
+            # Let the OS pick the interface when none could be listed or bound
+            sockets.append(self._create_search_socket(''))
+        return sockets
+    
+    def _create_search_socket(self, ip: str) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
             sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            sock.settimeout(1.0)
-            
-            # Send M-SEARCH requests for essential search targets
-            search_targets = [
-                self.SERVICE_TYPE,
-                'ssdp:all'
-            ]
-            
-            multicast_addr = (self.MULTICAST_GROUP, self.MULTICAST_PORT)
-            
-            # Start listening thread
-            listen_thread = threading.Thread(target=self._listen_for_responses, args=(sock,))
-            listen_thread.daemon = True
-            listen_thread.start()
-            
-            # Send M-SEARCH requests periodically
-            start_time = time.time()
-            while time.time() - start_time < search_time and not self.stop_discovery:
-                for target in search_targets:
+            try:
+                # Room for reply storms from ssdp:all searches on busy networks
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.RECEIVE_BUFFER_SIZE)
+            except OSError:
+                pass
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, self.multicast_ttl)
+            if ip:
+                sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(ip))
+            # Replies come back to the address the search was sent from
+            sock.bind((ip, 0))
+            sock.setblocking(False)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+    
+    async def _send_msearch_requests(self, transports: List[asyncio.DatagramTransport], interval: float = 1.0):
+        """Send M-SEARCH requests on every interface periodically until cancelled"""
+        import asyncio
+        
+        # Send M-SEARCH requests for essential search targets, ssdp:all makes every
+        # UPnP device on the network answer and can be turned off on noisy LANs
+        search_targets = [self.SERVICE_TYPE]
+        if self.search_all:
+            search_targets.append('ssdp:all')
+        
+        multicast_addr = (self.MULTICAST_GROUP, self.MULTICAST_PORT)
+        
+        while True:
+            for target in search_targets:
+                request = self.create_msearch_request(target).encode('utf-8')
+                for transport in transports:
                     try:
-                        request = self.create_msearch_request(target)
-                        sock.sendto(request.encode('utf-8'), multicast_addr)
+                        transport.sendto(request, multicast_addr)
                         logger.debug(f"Sent M-SEARCH for {target}")
                     except Exception as e:
                         logger.debug(f"Error sending M-SEARCH: {e}")
-                
-                time.sleep(1)
-            
-            self.stop_discovery = True
-            sock.close()
             
-            # Get detailed information for discovered servers
-            detailed_servers = []
-            for server in self.discovered_servers:
-                detailed_server = self.get_server_description(server)
-                if detailed_server:
-                    detailed_servers.append(detailed_server)
-            
-            # Group servers by USN to combine multiple IPs for the same server
-            unique_servers = []
-            seen_usns = set()
-            seen_ips = set()
-            
-            for server in detailed_servers:
-                usn = server.get('usn', '')
-                if usn:
-                    # Group by USN to handle same server on multiple network interfaces
-                    if usn not in seen_usns:
-                        seen_usns.add(usn)
-                        # Find all IPs for this server (same USN)
-                        server_ips = [s['ip'] for s in detailed_servers if s.get('usn', '') == usn]
-                        server['all_ips'] = server_ips
-                        unique_servers.append(server)
-                else:
-                    # Fallback to IP/port for servers without USN
-                    key = (server['ip'], server['port'])
-                    if key not in seen_ips:
-                        seen_ips.add(key)
-                        server['all_ips'] = [server['ip']]
-                        unique_servers.append(server)
-            
-            return unique_servers
+            await asyncio.sleep(interval)
+    
+    def _add_discovered_server(self, server_info: Dict[str, str]) -> bool:
+        """Remember a discovered server, returns False if it was already known"""
+        if not self.discovered_servers.add(server_info):
+            return False
+        
+        computer_name = server_info.get('computer_name', 'Unknown')
+        logger.debug(f"Discovered server: {server_info['ip']}:{server_info['port']} ({computer_name})")
+        return True
+    
+    def _fetch_descriptions(self, servers: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Get detailed information for servers, slow hosts are fetched in parallel"""
+        detailed_servers = []
+        if servers:
+            workers = max(1, min(self.description_workers, len(servers)))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                for detailed_server in executor.map(self.get_server_description, servers):
+                    if detailed_server:
+                        detailed_servers.append(detailed_server)
+        
+        return detailed_servers
+    
+    @property
+    def registry_running(self) -> bool:
+        """Whether the background NOTIFY listener is active"""
+        return self._registry_thread is not None and self._registry_thread.is_alive()
+    
+    def start_registry(self) -> bool:
+        """Join the SSDP multicast group and track NOTIFY announcements in the background"""
+        if self.registry_running:
+            return True
+        
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if hasattr(socket, 'SO_REUSEPORT'):
+                # The game itself may listen on the SSDP port on this machine
+                try:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+                except OSError:
+                    pass
+            sock.bind(('', self.MULTICAST_PORT))
             
+            # Announcements only arrive on interfaces that joined the group
+            joined = 0
+            for name, ip in self.search_interfaces():
+                membership = socket.inet_aton(self.MULTICAST_GROUP) + socket.inet_aton(ip)
+                try:
+                    sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+                    joined += 1
+                except OSError as e:
+                    logger.debug(f"Cannot join SSDP group on {name} ({ip}): {e}")
+            if not joined:
+                membership = struct.pack('4sl', socket.inet_aton(self.MULTICAST_GROUP), socket.INADDR_ANY)
+                sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+            sock.settimeout(1.0)
         except Exception as e:
-            logger.error(f"Error during server discovery: {e}")
-            return []
+            logger.warning(f"Cannot start SSDP registry: {e}")
+            return False
+        
+        self._registry_stop.clear()
+        self._registry_thread = threading.Thread(target=self._listen_for_announcements, args=(sock,))
+        self._registry_thread.daemon = True
+        self._registry_thread.start()
+        return True
+    
+    def stop_registry(self):
+        """Stop the background NOTIFY listener"""
+        self._registry_stop.set()
+        if self._registry_thread is not None:
+            self._registry_thread.join(timeout=2.0)
+            self._registry_thread = None
+    
+    def get_registry_servers(self) -> List[Dict[str, str]]:
+        """Get servers currently alive according to the registry"""
+        self._registry.evict_expired()
+        return self._fetch_descriptions(self._registry.servers())
     
-    def _listen_for_responses(self, sock: socket.socket):
-        """Listen for SSDP responses in a separate thread"""
-        while not self.stop_discovery:
+    def _update_registry(self, server_info: Dict[str, str]):
+        """Add or refresh a server in the registry"""
+        max_age = self._parse_max_age(server_info.get('cache_control', '')) or self.registry_max_age
+        expires_at = time.monotonic() + min(max_age, self.registry_max_age)
+        
+        if self._registry.add(server_info, expires_at):
+            logger.debug(f"Registry added server: {server_info['ip']}:{server_info['port']} "
+                         f"({server_info.get('computer_name', 'Unknown')})")
+    
+    def _remove_from_registry(self, usn: str):
+        """Forget a server that announced ssdp:byebye"""
+        if self._registry.remove(usn):
+            logger.debug(f"Registry removed server: {usn}")
+    
+    def _listen_for_announcements(self, sock: socket.socket):
+        """Listen for SSDP NOTIFY announcements in a separate thread"""
+        while not self._registry_stop.is_set():
             try:
-                data, addr = sock.recvfrom(1024)
-                response = data.decode('utf-8', errors='ignore')
-                
-                server_info = self.parse_ssdp_response(response)
-                if server_info and self._is_gamemaster_server(server_info):
-                    # Check if we already have this server by USN (to handle multiple IPs for same server)
-                    usn = server_info.get('usn', '')
-                    if usn and not any(s.get('usn', '') == usn for s in self.discovered_servers):
-                        self.discovered_servers.append(server_info)
-                        computer_name = server_info.get('computer_name', 'Unknown')
-                        logger.debug(f"Discovered server: {server_info['ip']}:{server_info['port']} ({computer_name})")
-                    elif not usn:
-                        # Fallback to IP/port check if no USN available
-                        if not any(s['ip'] == server_info['ip'] and s['port'] == server_info['port'] 
-                                 for s in self.discovered_servers):
-                            self.discovered_servers.append(server_info)
-                            computer_name = server_info.get('computer_name', 'Unknown')
-                            logger.debug(f"Discovered server: {server_info['ip']}:{server_info['port']} ({computer_name})")
-                        
+                data, addr = sock.recvfrom(2048)
             except socket.timeout:
                 continue
             except Exception as e:
-                if not self.stop_discovery:
-                    logger.debug(f"Error listening for responses: {e}")
+                if not self._registry_stop.is_set():
+                    logger.debug(f"Error listening for announcements: {e}")
                 break
+            
+            if not self.may_be_gamemaster_datagram(data, b'NOTIFY'):
+                continue
+            
+            announcement = self.parse_ssdp_notify(data.decode('utf-8', errors='ignore'))
+            if not announcement or not self._is_gamemaster_server(announcement):
+                continue
+            
+            if announcement['nts'] == 'ssdp:byebye':
+                self._remove_from_registry(announcement['usn'])
+            else:
+                self._update_registry(announcement)
+        
+        sock.close()
+    
+    def may_be_gamemaster_datagram(self, data: bytes, start: bytes) -> bool:
+        """Cheap check on raw bytes to drop foreign SSDP traffic before full parsing"""
+        return data.startswith(start) and self._GAMEMASTER_MARKER in data.lower()
     
     def _is_gamemaster_server(self, server_info: Dict[str, str]) -> bool:
         """Check if the server is a GameMaster server based on response headers"""
@@ -236,23 +685,1717 @@ class SSDPClient:
         )
 
 
+class _SSDPDiscoveryProtocol:
+    """Datagram protocol that queues GameMaster M-SEARCH responses"""
+    
+    # Implements asyncio.DatagramProtocol without subclassing it, so defining it does not import asyncio
+    
+    def __init__(self, ssdp_client: SSDPClient, queue: asyncio.Queue):
+        self.ssdp_client = ssdp_client
+        self.queue = queue
+    
+    def connection_made(self, transport: asyncio.BaseTransport):
+        pass
+    
+    def connection_lost(self, exc: Optional[Exception]):
+        pass
+    
+    def pause_writing(self):
+        pass
+    
+    def resume_writing(self):
+        pass
+    
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]):
+        if not self.ssdp_client.may_be_gamemaster_datagram(data, b'HTTP/1.1 200'):
+            return
+        
+        response = data.decode('utf-8', errors='ignore')
+        
+        server_info = self.ssdp_client.parse_ssdp_response(response)
+        if server_info and self.ssdp_client._is_gamemaster_server(server_info):
+            self.queue.put_nowait(server_info)
+    
+    def error_received(self, exc: Exception):
+        logger.debug(f"Error listening for responses: {exc}")
+
+
+@dataclass
+class CommandResult:
+    """Outcome of a single GameMaster command"""
+    command: str
+    args: List[str]
+    server: str = ''
+    delivered: bool = False
+    success: bool = False
+    message: str = ''
+    data: Dict[str, Any] = field(default_factory=dict)
+    raw: Optional[str] = None
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    # Time spent opening a new connection (DNS + TCP), 0 when a pooled one was reused
+    connect_time: float = 0.0
+    # Reported by the server: waiting for the Unity main thread and running the handler
+    server_queue_time: Optional[float] = None
+    server_execute_time: Optional[float] = None
+    # Later calls of the same coalesced command that were answered by this one
+    coalesced: int = 0
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram over a rolling time window with fixed memory"""
+    
+    MIN_VALUE = 1e-5       # 10 microseconds
+    GROWTH = 1.05          # ~5% relative precision per bucket
+    BUCKETS = 400          # covers up to ~50 minutes
+    
+    def __init__(self, window: float = 60.0):
+        self.window = window
+        self._current = [0] * self.BUCKETS
+        self._previous = [0] * self.BUCKETS
+        self._current_max = 0.0
+        self._previous_max = 0.0
+        self._rotated_at = time.monotonic()
+    
+    def _rotate(self):
+        """Start a new window, percentiles cover the current and the previous one"""
+        now = time.monotonic()
+        elapsed = now - self._rotated_at
+        if elapsed < self.window:
+            return
+        
+        if elapsed < 2 * self.window:
+            self._previous, self._previous_max = self._current, self._current_max
+        else:
+            self._previous, self._previous_max = [0] * self.BUCKETS, 0.0
+        self._current = [0] * self.BUCKETS
+        self._current_max = 0.0
+        self._rotated_at = now
+    
+    def record(self, value: float):
+        """Record a latency in seconds"""
+        self._rotate()
+        if value <= self.MIN_VALUE:
+            index = 0
+        else:
+            index = min(int(math.log(value / self.MIN_VALUE) / math.log(self.GROWTH)), self.BUCKETS - 1)
+        self._current[index] += 1
+        self._current_max = max(self._current_max, value)
+    
+    @property
+    def count(self) -> int:
+        self._rotate()
+        return sum(self._current) + sum(self._previous)
+    
+    @property
+    def max(self) -> float:
+        self._rotate()
+        return max(self._current_max, self._previous_max)
+    
+    def percentile(self, percent: float) -> float:
+        """Get the latency in seconds below which `percent` of samples fall"""
+        self._rotate()
+        counts = [current + previous for current, previous in zip(self._current, self._previous)]
+        total = sum(counts)
+        if not total:
+            return 0.0
+        
+        target = max(1, math.ceil(total * percent / 100.0))
+        cumulative = 0
+        for index, count in enumerate(counts):
+            cumulative += count
+            if cumulative >= target:
+                # Upper bound of the bucket, but never above the largest value seen
+                return min(self.MIN_VALUE * self.GROWTH ** (index + 1), self.max)
+        return self.max
+
+
+class CommandMetrics:
+    """Per-server latency histograms for each phase of a command, with optional JSON lines export"""
+    
+    # connect: DNS + TCP handshake, network: request/response transfer,
+    # queue: waiting for the Unity main thread, execute: command handler
+    PHASES = ('total', 'connect', 'network', 'queue', 'execute')
+    
+    def __init__(self, window: float = 60.0, export_path: Optional[str] = None):
+        self.window = window
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._export_file = open(export_path, 'a', encoding='utf-8') if export_path else None
+    
+    def record(self, result: CommandResult):
+        """Record timings of a finished command"""
+        if not result.server:
+            return
+        
+        server_time = (result.server_queue_time or 0.0) + (result.server_execute_time or 0.0)
+        phases = {
+            'total': result.elapsed,
+            'connect': result.connect_time if result.connect_time else None,
+            'network': max(result.elapsed - result.connect_time - server_time, 0.0),
+            'queue': result.server_queue_time,
+            'execute': result.server_execute_time
+        }
+        
+        with self._lock:
+            for phase, value in phases.items():
+                if value is None:
+                    continue
+                key = (result.server, phase)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = LatencyHistogram(self.window)
+                histogram.record(value)
+            
+            if self._export_file:
+                record = {
+                    'timestamp': time.time(),
+                    'server': result.server,
+                    'command': result.command,
+                    'success': result.success,
+                    'status_code': result.status_code
+                }
+                for phase, value in phases.items():
+                    record[f'{phase}_ms'] = round(value * 1000, 3) if value is not None else None
+                self._export_file.write(json.dumps(record) + '\n')
+                self._export_file.flush()
+    
+    def summary(self) -> List[Tuple[str, str, int, float, float, float, float]]:
+        """Get (server, phase, count, p50, p95, p99, max) rows, latencies in seconds"""
+        rows = []
+        with self._lock:
+            for server in sorted({server for server, _ in self._histograms}):
+                for phase in self.PHASES:
+                    histogram = self._histograms.get((server, phase))
+                    if histogram is None or not histogram.count:
+                        continue
+                    rows.append((server, phase, histogram.count, histogram.percentile(50),
+                                 histogram.percentile(95), histogram.percentile(99), histogram.max))
+        return rows
+    
+    def close(self):
+        """Close the export file"""
+        with self._lock:
+            if self._export_file:
+                self._export_file.close()
+                self._export_file = None
+
+
+class SessionRecorder:
+    """Append-only log of the commands sent in a session, one compact JSON object per line"""
+    
+    # A session line marks where a client run starts, replay does not wait across them
+    FORMAT_VERSION = 1
+    
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+    
+    def record(self, result: CommandResult):
+        """Append a finished command, stamped with the time it was sent"""
+        if not self.path or not result.server:
+            return
+        
+        entry = {
+            'timestamp': round(time.time() - result.elapsed, 6),
+            'server': result.server,
+            'command': result.command,
+            'args': result.args,
+            'success': result.success,
+            'status_code': result.status_code,
+            'elapsed_ms': round(result.elapsed * 1000, 3)
+        }
+        if result.error or result.message:
+            entry['message'] = result.error or result.message
+        
+        with self._lock:
+            try:
+                if self._file is None:
+                    directory = os.path.dirname(self.path)
+                    if directory:
+                        os.makedirs(directory, exist_ok=True)
+                    self._file = open(self.path, 'a', encoding='utf-8')
+                    self._write({'session': time.time(), 'version': self.FORMAT_VERSION})
+                self._write(entry)
+            except OSError as e:
+                logger.debug(f"Error writing session log: {e}")
+    
+    def _write(self, entry: Dict[str, Any]):
+        # Flushed per line, so a crashing game or client loses at most the command in progress
+        self._file.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        self._file.flush()
+    
+    def close(self):
+        """Close the log file"""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+    
+    @staticmethod
+    def load(path: str) -> List[Dict[str, Any]]:
+        """Read recorded commands in send order, each with its `offset` in seconds from the first one"""
+        sessions: List[List[Dict[str, Any]]] = [[]]
+        with open(path, encoding='utf-8') as log_file:
+            for line_number, line in enumerate(log_file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Most likely the last line of a session that was killed mid-write
+                    logger.warning(f"Skipping malformed line {line_number} in {path}")
+                    continue
+                if 'session' in entry:
+                    sessions.append([])
+                elif entry.get('command'):
+                    sessions[-1].append(entry)
+        
+        # Commands are logged when they finish, so concurrent ones may be out of send order
+        entries = []
+        offset = 0.0
+        for session in sessions:
+            session.sort(key=lambda entry: entry.get('timestamp', 0.0))
+            if not session:
+                continue
+            start = session[0].get('timestamp', 0.0)
+            for entry in session:
+                entry['offset'] = offset + entry.get('timestamp', start) - start
+                entries.append(entry)
+            # Sessions follow each other directly, the time between client runs is not replayed
+            offset = entries[-1]['offset']
+        return entries
+
+
+_JSON_NUMBER = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?')
+_JSON_NUMBER_CHARS = frozenset('0123456789+-.eE')
+_JSON_LITERALS = {'true': True, 'false': False, 'null': None}
+
+
+def _is_escaped(text: str, index: int) -> bool:
+    """Check whether the character at index is preceded by an odd number of backslashes"""
+    backslashes = 0
+    while index - backslashes > 0 and text[index - backslashes - 1] == '\\':
+        backslashes += 1
+    return backslashes % 2 == 1
+
+
+def iter_json_events(chunks: Iterable[str]) -> Iterator[Tuple[str, Any]]:
+    """Parse JSON text arriving in chunks into (event, value) pairs without building the document,
+    events are start_map, end_map, start_array, end_array, key and value"""
+    from json.decoder import scanstring
+    
+    chunks = iter(chunks)
+    buffer = ''
+    pos = 0
+    exhausted = False
+    # Open containers, '{' or '['
+    containers = []
+    expect_key = False
+    # How far the current string was already searched for its closing quote
+    scanned = 0
+    
+    while True:
+        # Separators carry no events, but after a comma inside an object a key follows
+        while pos < len(buffer) and buffer[pos] in ' \t\r\n,:':
+            if buffer[pos] == ',' and containers and containers[-1] == '{':
+                expect_key = True
+            pos += 1
+        
+        if pos < len(buffer):
+            char = buffer[pos]
+            event = None
+            if char in '{[':
+                containers.append(char)
+                expect_key = char == '{'
+                pos += 1
+                event = ('start_map' if char == '{' else 'start_array', None)
+            elif char in '}]':
+                if not containers:
+                    raise ValueError(f"Unexpected {char!r} in JSON")
+                containers.pop()
+                expect_key = False
+                pos += 1
+                event = ('end_map' if char == '}' else 'end_array', None)
+            elif char == '"':
+                end = buffer.find('"', max(scanned, pos + 1))
+                while end >= 0 and _is_escaped(buffer, end):
+                    end = buffer.find('"', end + 1)
+                if end >= 0:
+                    value, pos = scanstring(buffer, pos + 1)
+                    scanned = 0
+                    event = ('key' if expect_key else 'value', value)
+                    expect_key = False
+                else:
+                    scanned = len(buffer)
+            elif char == '-' or char.isdigit():
+                end = pos
+                while end < len(buffer) and buffer[end] in _JSON_NUMBER_CHARS:
+                    end += 1
+                # A number ending with the buffer may continue in the next chunk
+                if end < len(buffer) or exhausted:
+                    text = buffer[pos:end]
+                    if not _JSON_NUMBER.fullmatch(text):
+                        raise ValueError(f"Invalid number {text!r} in JSON")
+                    pos = end
+                    event = ('value', float(text) if any(c in text for c in '.eE') else int(text))
+            else:
+                for literal, value in _JSON_LITERALS.items():
+                    if buffer.startswith(literal, pos):
+                        pos += len(literal)
+                        event = ('value', value)
+                        break
+                else:
+                    if len(buffer) - pos >= 5 or exhausted:
+                        raise ValueError(f"Unexpected {char!r} in JSON")
+            
+            if event is not None:
+                yield event
+                if not containers:
+                    return
+                continue
+        
+        if exhausted:
+            raise ValueError("JSON document is incomplete")
+        
+        # Keep only the unparsed part, so memory is bounded by the largest single token
+        buffer = buffer[pos:]
+        scanned = max(scanned - pos, 0)
+        pos = 0
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+        else:
+            buffer += chunk
+
+
+class ResultRenderer:
+    """Prints a command response while it arrives, so large Data payloads are never held in memory"""
+    
+    # Smaller responses are parsed at once and printed by GameMasterClient.print_result
+    STREAM_THRESHOLD = 64 * 1024
+    CHUNK_SIZE = 64 * 1024
+    # Data entries every command result carries, not worth printing
+    HIDDEN_KEYS = ('command', 'arguments', 'timestamp', 'status')
+    
+    def __init__(self, max_lines: Optional[int] = None, page: bool = False,
+                 output_file: Optional[str] = None, prefix: str = ""):
+        self.max_lines = max_lines
+        self.page = page
+        self.output_file = output_file
+        self.prefix = prefix
+        # Whether the outcome was already printed while streaming
+        self.rendered = False
+        self.bytes_received = 0
+        # Other top-level values of the response, e.g. the server timings of a stream answer
+        self.fields: Dict[str, Any] = {}
+        self._lines = 0
+        self._hidden_lines = 0
+        self._skip_rest = False
+        self._page_size = 0
+    
+    def streams_everything(self) -> bool:
+        """Whether every successful response goes through the renderer, whatever its size"""
+        return bool(self.output_file or self.max_lines is not None or self.page)
+    
+    def wants(self, status_code: int, content_length: Optional[Union[str, int]]) -> bool:
+        """Whether a response should be streamed rather than read at once"""
+        if status_code != 200:
+            return False
+        if self.streams_everything():
+            return True
+        
+        try:
+            return int(content_length) > self.STREAM_THRESHOLD
+        except (TypeError, ValueError):
+            # Unknown size, could be anything
+            return True
+    
+    def render(self, result: CommandResult, chunks: Iterable[bytes]):
+        """Parse and print a response body, filling in Success and Message of the result"""
+        self.rendered = True
+        result.delivered = True
+        if self.page:
+            import shutil
+            self._page_size = max(shutil.get_terminal_size().lines - 2, 5)
+        
+        output = open(self.output_file, 'wb') if self.output_file else None
+        try:
+            text_chunks = self._decode(chunks, output)
+            self._render_response(result, iter_json_events(text_chunks))
+            # Whatever the parser did not need still belongs in the file
+            for _ in text_chunks:
+                pass
+        finally:
+            if output:
+                output.close()
+        
+        if output:
+            print(f"{self.prefix}💾 Saved {self.bytes_received / 1024:.1f} KB to {self.output_file}")
+    
+    def _decode(self, chunks: Iterable[bytes], output: Optional[Any]) -> Iterator[str]:
+        """Decode UTF-8 chunks, characters split between chunks included, copying raw bytes to output"""
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        for chunk in chunks:
+            self.bytes_received += len(chunk)
+            if output:
+                output.write(chunk)
+            yield decoder.decode(chunk)
+        yield decoder.decode(b'', final=True)
+    
+    def _render_response(self, result: CommandResult, events: Iterator[Tuple[str, Any]]):
+        """Walk the top-level response object, printing Data entries as they are parsed"""
+        event, _ = next(events)
+        if event != 'start_map':
+            raise ValueError("Response is not a JSON object")
+        
+        seen_success = False
+        header_printed = False
+        for event, key in events:
+            if event == 'end_map':
+                break
+            
+            event, value = next(events)
+            if key == 'Success' and event == 'value':
+                result.success = bool(value)
+                seen_success = True
+            elif key == 'Message' and event == 'value':
+                result.message = value or ''
+            elif key == 'Data':
+                # The server sends Success and Message first, print them before the data
+                if seen_success:
+                    self._print_header(result)
+                    header_printed = True
+                if self.output_file:
+                    # Only the file gets the data
+                    if header_printed:
+                        return
+                    self._skip(event, events)
+                elif event == 'start_map':
+                    self._render_data(events)
+                else:
+                    self._skip(event, events)
+            elif event == 'value':
+                self.fields[key] = value
+            else:
+                self._skip(event, events)
+        
+        if not header_printed:
+            self._print_header(result)
+        if self._hidden_lines:
+            print(f"{self.prefix}   ... {self._hidden_lines} more lines not shown")
+    
+    def _print_header(self, result: CommandResult):
+        if result.success:
+            print(f"{self.prefix}✅ {result.message or 'Command executed successfully'}")
+        else:
+            print(f"{self.prefix}❌ Command failed: {result.message or 'Unknown error'}")
+    
+    def _render_data(self, events: Iterator[Tuple[str, Any]]):
+        """Print every value of the Data object on its own line, prefixed with its path"""
+        for event, key in events:
+            if event == 'end_map':
+                return
+            
+            event, value = next(events)
+            if key in self.HIDDEN_KEYS:
+                self._skip(event, events)
+            else:
+                self._render_value(key, event, value, events)
+    
+    def _render_value(self, path: str, event: str, value: Any, events: Iterator[Tuple[str, Any]]):
+        if event == 'value':
+            self._line(f"{path}: {value}")
+            return
+        
+        is_map = event == 'start_map'
+        closing = 'end_map' if is_map else 'end_array'
+        index = 0
+        for child_event, child in events:
+            if child_event == closing:
+                if index == 0:
+                    self._line(f"{path}: {{}}" if is_map else f"{path}: []")
+                return
+            
+            if is_map:
+                child_path = f"{path}.{child}"
+                child_event, child = next(events)
+            else:
+                child_path = f"{path}[{index}]"
+            self._render_value(child_path, child_event, child, events)
+            index += 1
+    
+    @staticmethod
+    def _skip(event: str, events: Iterator[Tuple[str, Any]]):
+        """Consume a value without printing it"""
+        if event == 'value':
+            return
+        
+        depth = 1
+        for event, _ in events:
+            if event in ('start_map', 'start_array'):
+                depth += 1
+            elif event in ('end_map', 'end_array'):
+                depth -= 1
+                if depth == 0:
+                    return
+    
+    def _line(self, text: str):
+        """Print one data line, unless truncated or the user stopped paging"""
+        if not self._skip_rest and self.max_lines is not None and self._lines >= self.max_lines:
+            self._skip_rest = True
+        if not self._skip_rest and self._page_size and self._lines and self._lines % self._page_size == 0:
+            self._skip_rest = not self._next_page()
+        
+        if self._skip_rest:
+            self._hidden_lines += 1
+            return
+        
+        print(f"{self.prefix}   {text}")
+        self._lines += 1
+    
+    @staticmethod
+    def _next_page() -> bool:
+        """Wait for the user between pages, False to skip the rest"""
+        try:
+            return input("-- More (Enter: next page, q: skip the rest) --").strip().lower() != 'q'
+        except (EOFError, KeyboardInterrupt):
+            return False
+
+
+# Connection setup time of the request currently sent by this thread
+_connect_timing = threading.local()
+_timed_http_adapter_class = None
+
+
+def _get_timed_http_adapter_class() -> type:
+    """Build the HTTP adapter class on first use, it derives from requests and urllib3 classes"""
+    global _timed_http_adapter_class
+    if _timed_http_adapter_class is not None:
+        return _timed_http_adapter_class
+    
+    import urllib3
+    from requests.adapters import HTTPAdapter
+    
+    class _TimedHTTPConnection(urllib3.connection.HTTPConnection):
+        """HTTP connection that reports how long DNS resolution and the TCP handshake took"""
+        
+        def connect(self):
+            start_time = time.perf_counter()
+            try:
+                super().connect()
+            finally:
+                _connect_timing.elapsed = getattr(_connect_timing, 'elapsed', 0.0) + time.perf_counter() - start_time
+    
+    class _TimedHTTPConnectionPool(urllib3.HTTPConnectionPool):
+        ConnectionCls = _TimedHTTPConnection
+    
+    class _TimedHTTPAdapter(HTTPAdapter):
+        """HTTP adapter whose connections record their setup time"""
+        
+        def init_poolmanager(self, *args, **kwargs):
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = dict(self.poolmanager.pool_classes_by_scheme,
+                                                           http=_TimedHTTPConnectionPool)
+    
+    _timed_http_adapter_class = _TimedHTTPAdapter
+    return _timed_http_adapter_class
+
+
+class ServerSessionPool:
+    """Long-lived keep-alive HTTP sessions, one per GameMaster server"""
+    
+    def __init__(self, pool_size: int = 4, max_retries: int = 2, backoff_factor: float = 0.1):
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        # (ip, port, connect retries) -> session, multi-homed servers fail over instead of retrying
+        self._sessions: Dict[Tuple[str, int, int], requests.Session] = {}
+        self._lock = threading.Lock()
+        
+    def _create_session(self, connect_retries: int) -> requests.Session:
+        """Create a session with a bounded connection pool and retry policy"""
+        import requests
+        from urllib3.util.retry import Retry
+        
+        # Only connection failures are retried: commands are not idempotent,
+        # so a request that reached the server must never be sent twice
+        retry = Retry(
+            total=self.max_retries,
+            connect=connect_retries,
+            read=0,
+            status=0,
+            backoff_factor=self.backoff_factor,
+            raise_on_status=False
+        )
+        adapter = _get_timed_http_adapter_class()(pool_connections=1, pool_maxsize=self.pool_size, max_retries=retry)
+        
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.headers.update({'Content-Type': 'application/json'})
+        return session
+    
+    def get(self, ip: str, port: int, connect_retries: Optional[int] = None) -> requests.Session:
+        """Get the session for a server interface and connect retry count, creating it on first use
+        
+        Retries default to max_retries, an interface used with different counts gets one session each.
+        """
+        if connect_retries is None:
+            connect_retries = self.max_retries
+        key = (ip, port, connect_retries)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._create_session(connect_retries)
+                self._sessions[key] = session
+                logger.debug(f"Created HTTP session for {ip}:{port}")
+            return session
+    
+    def close(self):
+        """Close all sessions and their pooled connections"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+    
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Get connection reuse counters per server"""
+        result = {}
+        with self._lock:
+            for (ip, port, _), session in self._sessions.items():
+                adapter = session.get_adapter(f"http://{ip}:{port}/")
+                requests_sent = 0
+                connections_opened = 0
+                for pool_key in list(adapter.poolmanager.pools.keys()):
+                    pool = adapter.poolmanager.pools.get(pool_key)
+                    if pool is not None:
+                        requests_sent += pool.num_requests
+                        connections_opened += pool.num_connections
+                
+                counters = result.setdefault(f"{ip}:{port}", {'requests': 0, 'connections': 0, 'reused': 0})
+                counters['requests'] += requests_sent
+                counters['connections'] += connections_opened
+                counters['reused'] = max(counters['requests'] - counters['connections'], 0)
+        return result
+
+
+class StreamChannel:
+    """Persistent framed TCP connection to a server's command stream, shared by concurrent commands
+    
+    Every frame is a 4-byte big-endian length and a UTF-8 JSON object. Requests carry an Id the
+    server echoes, so answers are matched to their commands in whatever order they arrive.
+    """
+    
+    HEADER = struct.Struct('>I')
+    # The server writes the Id first, so it is found at the start of even the largest answer
+    ID_PATTERN = re.compile(rb'^\s*\{\s*"Id"\s*:\s*(-?\d+|null)')
+    ID_PREFIX_SIZE = 64
+    # Chunks of a large answer buffered for a command that is slow to print them
+    STREAMED_CHUNKS = 16
+    
+    def __init__(self, ip: str, port: int, connect_timeout: float = 2.0):
+        self.address = (ip, port)
+        start_time = time.perf_counter()
+        self._sock = socket.create_connection(self.address, timeout=connect_timeout)
+        self.connect_time = time.perf_counter() - start_time
+        self._sock.settimeout(None)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._ids = itertools.count(1)
+        # Request Id -> [answered event, parsed response or None if streamed, raw body or chunk queue,
+        # whether a large answer may be streamed]
+        self._pending: Dict[int, List[Any]] = {}
+        # Guards the pending table and keeps frames from interleaving on the socket
+        self._lock = threading.Lock()
+        self.closed = False
+        self.requests = 0
+        self._reader = threading.Thread(target=self._read_frames, daemon=True)
+        self._reader.start()
+    
+    def request(self, payload: Dict[str, Any], timeout: float = 10.0,
+                stream_large: bool = False) -> Tuple[Optional[Dict[str, Any]], Union[bytes, Iterator[bytes]]]:
+        """Send a command frame and wait for its answer, parsed and as the raw frame body
+        
+        With stream_large, an answer larger than ResultRenderer.STREAM_THRESHOLD is not parsed
+        but returned as None and an iterator over its body chunks, which must be consumed fully.
+        
+        Raises BrokenPipeError if nothing reached the server, so the command can safely go over
+        HTTP instead, and ConnectionResetError or socket.timeout once it may have been executed.
+        """
+        slot = [threading.Event(), None, None, stream_large]
+        with self._lock:
+            if self.closed:
+                raise BrokenPipeError("Command stream is closed")
+            request_id = next(self._ids)
+            body = json.dumps(dict(payload, Id=request_id)).encode('utf-8')
+            self._pending[request_id] = slot
+            try:
+                # The server only acts on complete frames, so a failed send never runs the command
+                self._sock.sendall(self.HEADER.pack(len(body)) + body)
+            except OSError as e:
+                self._close()
+                raise BrokenPipeError(f"Command stream send failed: {e}") from e
+            self.requests += 1
+        
+        if not slot[0].wait(timeout):
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise socket.timeout("No answer on the command stream")
+        if slot[2] is None:
+            raise ConnectionResetError("Command stream closed before the server answered")
+        if slot[1] is None:
+            return None, self._iter_chunks(slot[2], timeout)
+        return slot[1], slot[2]
+    
+    @staticmethod
+    def _iter_chunks(chunks: queue.Queue, timeout: float) -> Iterator[bytes]:
+        """Body chunks of a streamed answer as the reader receives them"""
+        while True:
+            try:
+                chunk = chunks.get(timeout=timeout)
+            except queue.Empty:
+                raise socket.timeout("Command stream answer stalled")
+            if chunk is None:
+                return
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+    
+    def close(self):
+        """Close the connection, commands still waiting get no answer"""
+        with self._lock:
+            self._close()
+    
+    def _close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+        for slot in self._pending.values():
+            slot[0].set()
+        self._pending.clear()
+    
+    def _receive(self, buffer: bytearray, size: int) -> bool:
+        """Read until the buffer holds at least size bytes, False if the connection closed first"""
+        while len(buffer) < size:
+            data = self._sock.recv(65536)
+            if not data:
+                return False
+            buffer += data
+        return True
+    
+    def _read_frames(self):
+        """Hand answers to the waiting commands until the connection closes"""
+        buffer = bytearray()
+        try:
+            while self._receive(buffer, self.HEADER.size):
+                length = self.HEADER.unpack_from(buffer)[0]
+                end = self.HEADER.size + length
+                
+                if length > ResultRenderer.STREAM_THRESHOLD:
+                    if not self._receive(buffer, self.HEADER.size + self.ID_PREFIX_SIZE):
+                        break
+                    slot = self._take_streamed_slot(buffer[self.HEADER.size:self.HEADER.size + self.ID_PREFIX_SIZE])
+                    if slot is not None:
+                        if not self._stream_frame(buffer, end, slot):
+                            break
+                        continue
+                
+                if not self._receive(buffer, end):
+                    break
+                body = bytes(buffer[self.HEADER.size:end])
+                del buffer[:end]
+                response = json.loads(body.decode('utf-8'))
+                
+                with self._lock:
+                    slot = self._pending.pop(response.get('Id'), None)
+                if slot is None:
+                    logger.debug(f"Unmatched frame on command stream {self.address}: {response}")
+                    continue
+                slot[1] = response
+                slot[2] = body
+                slot[0].set()
+        except (OSError, ValueError) as e:
+            logger.debug(f"Command stream {self.address} failed: {e}")
+        finally:
+            self.close()
+    
+    def _take_streamed_slot(self, prefix: bytes) -> Optional[List[Any]]:
+        """Get the waiting command a large answer can be streamed to, by the Id at its start"""
+        match = self.ID_PATTERN.match(bytes(prefix))
+        if not match or match.group(1) == b'null':
+            return None
+        
+        request_id = int(match.group(1))
+        with self._lock:
+            slot = self._pending.get(request_id)
+            if slot is None or not slot[3]:
+                # Nobody prints it as it arrives, it is parsed as a whole
+                return None
+            del self._pending[request_id]
+            return slot
+    
+    def _stream_frame(self, buffer: bytearray, end: int, slot: List[Any]) -> bool:
+        """Pass a large answer to its command chunk by chunk, False if the connection broke"""
+        chunks = queue.Queue(maxsize=self.STREAMED_CHUNKS)
+        slot[2] = chunks
+        slot[0].set()
+        
+        def put(chunk: Any) -> bool:
+            try:
+                chunks.put(chunk, timeout=10.0)
+                return True
+            except queue.Full:
+                # The command stopped reading, the rest of the answer can no longer be skipped
+                return False
+        
+        head = bytes(buffer[self.HEADER.size:end])
+        remaining = end - self.HEADER.size - len(head)
+        del buffer[:min(end, len(buffer))]
+        if not put(head):
+            return False
+        
+        while remaining > 0:
+            try:
+                data = self._sock.recv(min(65536, remaining))
+            except OSError:
+                data = b''
+            if not data:
+                put(ConnectionResetError("Command stream closed in the middle of an answer"))
+                return False
+            remaining -= len(data)
+            if not put(data):
+                return False
+        return put(None)
+
+
+class StreamChannelPool:
+    """One command stream per server interface, with HTTP used for servers that have none"""
+    
+    # Do not retry a stream that could not be opened on every command
+    RETRY_AFTER = 30.0
+    
+    def __init__(self, connect_timeout: float = 2.0):
+        self.connect_timeout = connect_timeout
+        self._channels: Dict[Tuple[str, int], StreamChannel] = {}
+        self._failed: Dict[Tuple[str, int], float] = {}
+        # One lock per address, held while connecting so concurrent commands share one connection
+        self._connecting: Dict[Tuple[str, int], threading.Lock] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, ip: str, port: int) -> Optional[StreamChannel]:
+        """Get an open channel, connecting on first use, or None to fall back to HTTP"""
+        key = (ip, port)
+        channel = self._get_open(key)
+        if channel is not False:
+            return channel
+        
+        with self._lock:
+            connecting = self._connecting.setdefault(key, threading.Lock())
+        # An unreachable server only holds up its own commands, not those for other servers
+        with connecting:
+            channel = self._get_open(key)
+            if channel is not False:
+                return channel
+            
+            try:
+                channel = StreamChannel(ip, port, self.connect_timeout)
+            except OSError as e:
+                logger.debug(f"Command stream {ip}:{port} unavailable, using HTTP: {e}")
+                with self._lock:
+                    self._failed[key] = time.monotonic() + self.RETRY_AFTER
+                    self._channels.pop(key, None)
+                return None
+            
+            with self._lock:
+                self._channels[key] = channel
+            logger.debug(f"Opened command stream to {ip}:{port}")
+            return channel
+    
+    def _get_open(self, key: Tuple[str, int]) -> Union[StreamChannel, None, bool]:
+        """Get the open channel, None while the address is failed, False if it must be connected"""
+        with self._lock:
+            channel = self._channels.get(key)
+            if channel is not None and not channel.closed:
+                return channel
+            if time.monotonic() < self._failed.get(key, 0.0):
+                return None
+            return False
+    
+    def close(self):
+        """Close all channels and forget failed servers"""
+        with self._lock:
+            for channel in self._channels.values():
+                channel.close()
+            self._channels.clear()
+            self._failed.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """Get commands sent per open channel"""
+        with self._lock:
+            return {f"{ip}:{port}": channel.requests for (ip, port), channel in self._channels.items()
+                    if not channel.closed}
+
+
+class InterfaceSelector:
+    """Picks the lowest-latency interface of multi-homed servers and fails over when it stops answering"""
+    
+    # Smoothing factor for round-trip time averages
+    RTT_ALPHA = 0.3
+    # Only switch to another interface when it is clearly faster, to avoid flapping
+    SWITCH_RATIO = 0.8
+    # Servers without commands for this long are no longer probed, they are raced again on next use
+    IDLE_AFTER = 60.0
+    
+    def __init__(self, probe_interval: float = 5.0, probe_timeout: float = 1.0):
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self._servers: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=8)
+        self._monitor_thread = None
+        self._monitor_stop = threading.Event()
+    
+    def select(self, server: Dict[str, str]) -> str:
+        """Get the interface to send commands to, racing all interfaces on first use"""
+        all_ips = server.get('all_ips') or [server['ip']]
+        if len(all_ips) < 2:
+            return server['ip']
+        
+        key = ServerTable.key_for(server)
+        with self._lock:
+            state = self._servers.get(key)
+            if state is not None and state['ips'] == all_ips:
+                state['used'] = time.monotonic()
+                if state['active']:
+                    return state['active']
+            else:
+                state = {'port': server['port'], 'ips': list(all_ips), 'rtt': {}, 'down': set(), 'active': None,
+                         'used': time.monotonic()}
+                self._servers[key] = state
+        
+        # Race every interface and lock onto the first to answer, the rest keep measuring
+        futures = [self._executor.submit(self._probe, state, ip) for ip in all_ips]
+        for future in concurrent.futures.as_completed(futures):
+            if future.result():
+                break
+        
+        self._start_monitor()
+        with self._lock:
+            if not state['active']:
+                # Nothing answered: let the command report the error on the advertised address
+                state['active'] = server['ip']
+            return state['active']
+    
+    def report_failure(self, server: Dict[str, str], ip: str) -> Optional[str]:
+        """Mark an interface as unreachable and get the next best one, if any"""
+        key = ServerTable.key_for(server)
+        with self._lock:
+            state = self._servers.get(key)
+            if state is None:
+                return None
+            
+            state['down'].add(ip)
+            state['rtt'].pop(ip, None)
+            if state['active'] == ip:
+                state['active'] = self._fastest(state)
+                if state['active']:
+                    logger.info(f"Interface {ip} stopped answering, failing over to {state['active']}")
+            return state['active']
+    
+    def active(self, server: Dict[str, str]) -> str:
+        """Get the interface currently used for a server without probing"""
+        with self._lock:
+            state = self._servers.get(ServerTable.key_for(server))
+            return state['active'] if state and state['active'] else server['ip']
+    
+    def round_trip_times(self, server: Dict[str, str]) -> Dict[str, Optional[float]]:
+        """Get smoothed round-trip times per interface, None for unreachable ones"""
+        with self._lock:
+            state = self._servers.get(ServerTable.key_for(server))
+            if state is None:
+                return {}
+            return {ip: state['rtt'].get(ip) for ip in state['ips']}
+    
+    def clear(self):
+        """Forget all measurements, e.g. after rediscovery"""
+        with self._lock:
+            self._servers.clear()
+    
+    def stop(self):
+        """Stop background measurements"""
+        self._monitor_stop.set()
+        if self._monitor_thread:
+            self._monitor_thread.join(timeout=self.probe_timeout + 1.0)
+            self._monitor_thread = None
+        self._executor.shutdown(wait=False)
+    
+    def _probe(self, state: Dict[str, Any], ip: str) -> bool:
+        """Measure one interface and update the server's active interface"""
+        import requests
+        
+        start_time = time.perf_counter()
+        try:
+            response = requests.get(f"http://{ip}:{state['port']}/", timeout=self.probe_timeout)
+            alive = response.status_code == 200
+        except Exception:
+            alive = False
+        rtt = time.perf_counter() - start_time
+        
+        with self._lock:
+            if not alive:
+                state['down'].add(ip)
+                state['rtt'].pop(ip, None)
+                if state['active'] == ip:
+                    state['active'] = self._fastest(state)
+                    logger.info(f"Interface {ip} stopped answering, "
+                                f"failing over to {state['active'] or 'nothing'}")
+                return False
+            
+            state['down'].discard(ip)
+            previous = state['rtt'].get(ip)
+            state['rtt'][ip] = rtt if previous is None else previous + self.RTT_ALPHA * (rtt - previous)
+            
+            active = state['active']
+            if not active or active in state['down']:
+                state['active'] = ip
+            elif ip != active and state['rtt'][ip] < state['rtt'].get(active, math.inf) * self.SWITCH_RATIO:
+                logger.info(f"Switching to faster interface {ip} "
+                            f"({state['rtt'][ip] * 1000:.1f} ms vs {state['rtt'][active] * 1000:.1f} ms)")
+                state['active'] = ip
+            return True
+    
+    @staticmethod
+    def _fastest(state: Dict[str, Any]) -> Optional[str]:
+        """Get the reachable interface with the lowest round-trip time"""
+        candidates = [ip for ip in state['ips'] if ip in state['rtt'] and ip not in state['down']]
+        return min(candidates, key=lambda ip: state['rtt'][ip]) if candidates else None
+    
+    def _start_monitor(self):
+        """Start re-measuring interfaces in the background, once"""
+        with self._lock:
+            if self._monitor_thread is not None:
+                return
+            self._monitor_stop.clear()
+            self._monitor_thread = threading.Thread(target=self._monitor)
+            self._monitor_thread.daemon = True
+            self._monitor_thread.start()
+    
+    def _monitor(self):
+        """Periodically probe every interface of the servers commands went to lately"""
+        while not self._monitor_stop.wait(self.probe_interval):
+            now = time.monotonic()
+            with self._lock:
+                # Every probe is answered on the game's main thread, idle servers are left alone
+                for key in [key for key, state in self._servers.items() if now - state['used'] > self.IDLE_AFTER]:
+                    del self._servers[key]
+                probes = [(state, ip) for state in self._servers.values() for ip in state['ips']]
+            
+            futures = [self._executor.submit(self._probe, state, ip) for state, ip in probes]
+            concurrent.futures.wait(futures)
+
+
+class ServerHealthMonitor:
+    """Probes the status endpoint of many servers on a short interval and keeps a bounded history of each"""
+    
+    # Samples kept per server, 2 minutes at the default interval
+    HISTORY = 240
+    TREND_WIDTH = 24
+    SPARKS = '▁▂▃▄▅▆▇█'
+    # Parallel probes, and pooled connections per server
+    WORKERS = 16
+    
+    def __init__(self, interval: float = 0.5, timeout: float = 0.5, down_after: int = 2,
+                 history: int = HISTORY):
+        self.interval = interval
+        self.timeout = timeout
+        # Consecutive failed probes before a server counts as down, one lost probe is not an outage
+        self.down_after = down_after
+        self.history = history
+        # Server key -> server info, samples of (time, round-trip time or None) and state
+        self._servers: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        import requests
+        # No retries: a refused connection is an answer, not something to hide
+        self._session = requests.Session()
+        self._pool_size = 0
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.WORKERS)
+        self.events: collections.deque = collections.deque(maxlen=5)
+    
+    def add(self, server: Dict[str, str]) -> bool:
+        """Start watching a server, returns False if it is already watched"""
+        key = ServerTable.key_for(server)
+        with self._lock:
+            if key in self._servers:
+                return False
+            self._servers[key] = {
+                'server': server,
+                'samples': collections.deque(maxlen=self.history),
+                'up': None,
+                'since': time.monotonic(),
+                'failures': 0,
+                'flaps': 0
+            }
+            return True
+    
+    def probe_all(self):
+        """Probe every watched server once, in parallel"""
+        with self._lock:
+            states = list(self._servers.values())
+        self._fit_connection_pools(len(states))
+        concurrent.futures.wait([self._executor.submit(self._probe, state) for state in states])
+    
+    def _fit_connection_pools(self, servers: int):
+        """Keep a connection pool per server, evicted pools would add connect time to the round trips"""
+        if servers <= self._pool_size:
+            return
+        from requests.adapters import HTTPAdapter
+        
+        self._pool_size = max(servers, self._pool_size * 2, self.WORKERS)
+        adapter = HTTPAdapter(pool_connections=self._pool_size, pool_maxsize=self.WORKERS, max_retries=0)
+        # The replaced adapter would keep its pooled sockets open until garbage collected
+        self._session.get_adapter('http://').close()
+        self._session.mount('http://', adapter)
+    
+    def _probe(self, state: Dict[str, Any]):
+        server = state['server']
+        start_time = time.perf_counter()
+        try:
+            response = self._session.get(f"http://{server['ip']}:{server['port']}/", timeout=self.timeout)
+            alive = response.status_code == 200
+        except Exception:
+            alive = False
+        rtt = time.perf_counter() - start_time
+        
+        with self._lock:
+            state['samples'].append((time.time(), rtt if alive else None))
+            state['failures'] = 0 if alive else state['failures'] + 1
+            if alive:
+                up = True
+            elif state['failures'] >= self.down_after or state['up'] is None:
+                up = False
+            else:
+                up = state['up']
+            
+            if up != state['up']:
+                if state['up'] is not None:
+                    state['flaps'] += 1
+                    name = server.get('computer_name') or server['ip']
+                    change = "back up" if up else "down"
+                    self.events.append(f"{time.strftime('%H:%M:%S')} {'🟢' if up else '🔴'} {name} {change}")
+                state['up'] = up
+                state['since'] = time.monotonic()
+    
+    def rows(self) -> List[Dict[str, Any]]:
+        """Snapshot of every server's health for display"""
+        now = time.monotonic()
+        rows = []
+        with self._lock:
+            for state in self._servers.values():
+                samples = list(state['samples'])
+                rtts = sorted(rtt for _, rtt in samples if rtt is not None)
+                last_rtt = samples[-1][1] if samples else None
+                rows.append({
+                    'server': state['server'],
+                    'up': state['up'],
+                    'for': now - state['since'],
+                    'availability': len(rtts) / len(samples) if samples else None,
+                    'last': last_rtt,
+                    'p50': rtts[len(rtts) // 2] if rtts else None,
+                    'p95': rtts[min(len(rtts) - 1, int(len(rtts) * 0.95))] if rtts else None,
+                    'trend': self._trend([rtt for _, rtt in samples[-self.TREND_WIDTH:]]),
+                    'flaps': state['flaps']
+                })
+        rows.sort(key=lambda row: (row['up'] is not False, (row['server'].get('computer_name') or '').lower()))
+        return rows
+    
+    @classmethod
+    def _trend(cls, rtts: List[Optional[float]]) -> str:
+        """Sparkline of recent round-trip times, x for failed probes"""
+        known = [rtt for rtt in rtts if rtt is not None]
+        if not known:
+            return 'x' * len(rtts)
+        low, high = min(known), max(known)
+        spread = high - low or 1.0
+        return ''.join('x' if rtt is None else cls.SPARKS[int((rtt - low) / spread * (len(cls.SPARKS) - 1))]
+                       for rtt in rtts)
+    
+    def render(self) -> str:
+        """Health table of all watched servers, followed by the latest state changes"""
+        def ms(value: Optional[float]) -> str:
+            return f"{value * 1000:.1f}" if value is not None else "-"
+        
+        lines = [f"{'':2} {'Server':<20} {'Address':<22} {'For':>8} {'Avail':>6} {'RTT ms':>7} "
+                 f"{'p50':>7} {'p95':>7} {'Flaps':>5}  Trend"]
+        for row in self.rows():
+            server = row['server']
+            marker = '⚪' if row['up'] is None else '🟢' if row['up'] else '🔴'
+            availability = f"{row['availability'] * 100:.0f}%" if row['availability'] is not None else "-"
+            lines.append(f"{marker} {(server.get('computer_name') or 'Unknown')[:20]:<20} "
+                         f"{server['ip'] + ':' + str(server['port']):<22} {self._duration(row['for']):>8} "
+                         f"{availability:>6} {ms(row['last']):>7} {ms(row['p50']):>7} {ms(row['p95']):>7} "
+                         f"{row['flaps']:>5}  {row['trend']}")
+        if self.events:
+            lines.append("")
+            lines.extend(self.events)
+        return '\n'.join(lines)
+    
+    @staticmethod
+    def _duration(seconds: float) -> str:
+        if seconds < 60:
+            return f"{seconds:.0f}s"
+        if seconds < 3600:
+            return f"{seconds // 60:.0f}m{seconds % 60:02.0f}s"
+        return f"{seconds // 3600:.0f}h{seconds % 3600 // 60:02.0f}m"
+    
+    def close(self):
+        """Stop the probe threads and close their connections"""
+        self._executor.shutdown(wait=False)
+        self._session.close()
+
+
+class CommandCatalogue:
+    """Registered commands per server, loaded once from the status endpoint"""
+    
+    VERSION_HEADER = 'X-GM-Commands-Version'
+    # An unknown command is only rejected locally after re-checking a catalogue this old
+    MAX_AGE = 30.0
+    
+    def __init__(self):
+        # Server key -> version, load time, commands by lower-cased name and their sorted names
+        self._catalogues: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def load(self, server: Dict[str, str], session: requests.Session, ip: str,
+             timeout: float = 2.0) -> Dict[str, Any]:
+        """Fetch the command list of a server and store it under the server's USN"""
+        response = session.get(f"http://{ip}:{server['port']}/", timeout=timeout)
+        response.raise_for_status()
+        status = response.json()
+        
+        descriptions = status.get('Commands')
+        if not isinstance(descriptions, dict):
+            # Older servers only list command names
+            descriptions = {name: '' for name in status.get('RegisteredCommands') or []}
+        
+        # Command names are case-insensitive on the server
+        commands = {name.lower(): (name, description or '') for name, description in descriptions.items()}
+        catalogue = {
+            'version': status.get('CommandsVersion') or response.headers.get(self.VERSION_HEADER),
+            'loaded_at': time.monotonic(),
+            'outdated': False,
+            'commands': commands,
+            'names': sorted(commands),
+            # Older servers and servers started without the command stream do not advertise one
+            'stream_port': status.get('StreamPort')
+        }
+        with self._lock:
+            self._catalogues[ServerTable.key_for(server)] = catalogue
+        logger.debug(f"Loaded {len(commands)} commands of {server['ip']}:{server['port']}")
+        return catalogue
+    
+    def get(self, server: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Get the loaded catalogue of a server"""
+        with self._lock:
+            return self._catalogues.get(ServerTable.key_for(server))
+    
+    def is_stale(self, catalogue: Dict[str, Any]) -> bool:
+        return catalogue['outdated'] or time.monotonic() - catalogue['loaded_at'] > self.MAX_AGE
+    
+    def check_version(self, server: Dict[str, str], version: Optional[str]):
+        """Mark a server's catalogue outdated when the server reports a different commands version"""
+        if not version:
+            return
+        
+        key = ServerTable.key_for(server)
+        with self._lock:
+            catalogue = self._catalogues.get(key)
+            if catalogue is not None and catalogue['version'] != version and not catalogue['outdated']:
+                logger.debug(f"Commands of {key} changed, catalogue will be reloaded")
+                catalogue['outdated'] = True
+    
+    def invalidate(self, server: Optional[Dict[str, str]] = None):
+        """Drop the catalogue of one server, or of all servers"""
+        with self._lock:
+            if server is None:
+                self._catalogues.clear()
+            else:
+                self._catalogues.pop(ServerTable.key_for(server), None)
+    
+    @staticmethod
+    def complete(catalogue: Dict[str, Any], prefix: str) -> List[str]:
+        """Get command names starting with a prefix, ignoring case"""
+        names = catalogue['names']
+        prefix = prefix.lower()
+        matches = []
+        index = bisect.bisect_left(names, prefix)
+        while index < len(names) and names[index].startswith(prefix):
+            matches.append(catalogue['commands'][names[index]][0])
+            index += 1
+        return matches
+
+
+class ServerCache:
+    """Last known servers persisted between runs, so the client can reconnect without discovery"""
+    
+    FIELDS = ('usn', 'ip', 'all_ips', 'port', 'location', 'server', 'computer_name',
+              'friendly_name', 'model_name')
+    MAX_SERVERS = 16
+    
+    def __init__(self, path: Optional[str]):
+        self.path = path
+    
+    def load(self) -> List[Dict[str, str]]:
+        """Get cached servers, most recently used first"""
+        if not self.path or not os.path.exists(self.path):
+            return []
+        
+        try:
+            with open(self.path, encoding='utf-8') as cache_file:
+                servers = json.load(cache_file).get('servers', [])
+            return [server for server in servers if server.get('ip') and server.get('port')]
+        except Exception as e:
+            logger.debug(f"Error reading server cache: {e}")
+            return []
+    
+    def save(self, servers: List[Dict[str, str]], selected: Optional[Dict[str, str]] = None):
+        """Remember servers, the selected one first, keeping older entries that were not seen this time"""
+        if not self.path:
+            return
+        
+        now = time.time()
+        # A selected server loaded from the cache is described by what this discovery found
+        discovered = {ServerTable.key_for(server): server for server in servers}
+        candidates = [(server, True) for server in ([selected] if selected else []) + servers]
+        candidates += [(server, False) for server in self.load()]
+        
+        merged = []
+        seen = set()
+        for server, seen_now in candidates:
+            key = ServerTable.key_for(server)
+            if key in seen:
+                continue
+            seen.add(key)
+            server = discovered.get(key, server)
+            entry = {field: server[field] for field in self.FIELDS if field in server}
+            # Only servers carried over from an earlier run keep the time they were last seen
+            entry['last_seen'] = now if seen_now else server.get('last_seen', now)
+            merged.append(entry)
+        
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            
+            # Write to a temporary file first so a crash never leaves a truncated cache
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as cache_file:
+                json.dump({'servers': merged[:self.MAX_SERVERS]}, cache_file, indent=2)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            logger.debug(f"Error writing server cache: {e}")
+
+
+class RateLimiter:
+    """Token bucket per server, bounding how many commands per second reach each game"""
+    
+    def __init__(self, rate: Optional[float] = None, burst: int = 10):
+        # None disables the limit
+        self.rate = rate
+        self.burst = max(1, burst)
+        # Server key -> [tokens, last refill time]
+        self._buckets: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self.throttled = 0
+        self.throttled_time = 0.0
+    
+    def acquire(self, server: Dict[str, str]):
+        """Wait until the server's bucket has a token and take it"""
+        if not self.rate:
+            return
+        
+        key = ServerTable.key_for(server)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = self._buckets[key] = [float(self.burst), now]
+                bucket[0] = min(float(self.burst), bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+                if bucket[0] >= 1.0:
+                    bucket[0] -= 1.0
+                    if waited:
+                        self.throttled += 1
+                        self.throttled_time += waited
+                    return
+                delay = (1.0 - bucket[0]) / self.rate
+            # Sleeping outside the lock lets other servers' commands through meanwhile
+            time.sleep(delay)
+            waited += delay
+
+
+class CommandCoalescer:
+    """Merges repeated idempotent commands that are still waiting to be sent
+    
+    The policy maps lower-cased command names to the argument indices that identify what the
+    command changes, e.g. SetGameSpeed -> () or SetParam -> (0,), None keys on all arguments.
+    A call with the same key as a waiting one replaces its arguments, and both get the result
+    of the single command sent. At most one command per key is in flight at a time.
+    """
+    
+    def __init__(self, policy: Optional[Dict[str, Optional[Tuple[int, ...]]]] = None):
+        self.policy = policy or {}
+        # Key -> batch of calls waiting to be sent as one command
+        self._waiting: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        self._in_flight = set()
+        self._condition = threading.Condition()
+        self.merged = 0
+    
+    @classmethod
+    def parse_policy(cls, entries: Optional[List[str]]) -> Dict[str, Optional[Tuple[int, ...]]]:
+        """Parse "COMMAND[:INDEX,...]" entries, "*" as the indices keys on all arguments"""
+        return dict(cls.parse_entry(entry) for entry in entries or [])
+    
+    @staticmethod
+    def parse_entry(entry: str) -> Tuple[str, Optional[Tuple[int, ...]]]:
+        """Parse one "COMMAND[:INDEX,...]" entry, raises ValueError if it is malformed"""
+        command, _, indices = entry.partition(':')
+        command, indices = command.strip(), indices.strip()
+        if not command:
+            raise ValueError(f"missing command name in '{entry}'")
+        if indices == '*':
+            return command.lower(), None
+        
+        parsed = []
+        for index in indices.split(','):
+            if not index.strip():
+                continue
+            if not index.strip().isdigit():
+                raise ValueError(f"argument index '{index.strip()}' in '{entry}' is not a number or '*'")
+            parsed.append(int(index))
+        return command.lower(), tuple(parsed)
+    
+    def key_for(self, server: Dict[str, str], command: str,
+                args: List[str]) -> Optional[Tuple[Any, ...]]:
+        """Coalescing key of a call, None if the command is not coalesced"""
+        name = command.lower()
+        if name not in self.policy:
+            return None
+        indices = self.policy[name]
+        target = tuple(args) if indices is None else tuple(args[i] if i < len(args) else None for i in indices)
+        return (ServerTable.key_for(server), name, target)
+    
+    def run(self, key: Tuple[Any, ...], args: List[str],
+            send: Callable[[List[str]], CommandResult],
+            wait: Callable[[], None]) -> CommandResult:
+        """Send the command for a key, or join a waiting call with the same key and share its result"""
+        with self._condition:
+            batch = self._waiting.get(key)
+            if batch is not None:
+                # The latest value wins, it is what the earlier calls would have been overwritten with
+                batch['args'] = list(args)
+                batch['calls'] += 1
+                self.merged += 1
+                follower = True
+            else:
+                batch = self._waiting[key] = {'args': list(args), 'calls': 1,
+                                              'done': threading.Event(), 'result': None}
+                follower = False
+        
+        if follower:
+            batch['done'].wait()
+            return batch['result']
+        
+        result = CommandResult(command=key[1], args=batch['args'], error="Command was not sent")
+        try:
+            with self._condition:
+                while key in self._in_flight:
+                    self._condition.wait()
+                self._in_flight.add(key)
+            try:
+                # Calls arriving while this one waits for the rate limit are still merged into it
+                wait()
+                with self._condition:
+                    del self._waiting[key]
+                    sent_args = batch['args']
+                result = send(sent_args)
+            finally:
+                with self._condition:
+                    self._in_flight.discard(key)
+                    if self._waiting.get(key) is batch:
+                        del self._waiting[key]
+                    self._condition.notify_all()
+        finally:
+            # Everything merged until the command was taken off the waiting list shares its result
+            result.coalesced = batch['calls'] - 1
+            batch['result'] = result
+            batch['done'].set()
+        return result
+
+
 class GameMasterClient:
     """Client for communicating with GameMaster servers"""
     
-    def __init__(self):
-        self.current_server = None
-        self.ssdp_client = SSDPClient()
+    # Handled by the client itself, never sent to servers
+    CLIENT_COMMANDS = ['EXIT', 'RESTART', 'STATS', 'BROADCAST']
+    # Fail over to another interface quickly instead of waiting for the full command timeout
+    CONNECT_TIMEOUT = 2.0
+    
+    def __init__(self, pool_size: int = 4, max_retries: int = 2, backoff_factor: float = 0.1,
+                 quiet_period: Optional[float] = 0.5, first_n: Optional[int] = None,
+                 use_registry: bool = False, search_all: bool = True, metrics_file: Optional[str] = None,
+                 cache_file: Optional[str] = None, max_lines: Optional[int] = None, page: bool = False,
+                 record_file: Optional[str] = None, use_stream: bool = False,
+                 rate_limit: Optional[float] = None, burst: int = 10,
+                 coalesce: Optional[Dict[str, Optional[Tuple[int, ...]]]] = None, multicast_ttl: int = 2,
+                 include_interfaces: Optional[List[str]] = None, exclude_interfaces: Optional[List[str]] = None):
+        self.current_server = None
+        self.server_cache = ServerCache(cache_file)
+        # Background discovery after a cached reconnect must not overlap with RESTART
+        self._discovery_lock = threading.Lock()
+        self.ssdp_client = SSDPClient(search_all=search_all, multicast_ttl=multicast_ttl,
+                                      include_interfaces=include_interfaces, exclude_interfaces=exclude_interfaces)
+        self.sessions = ServerSessionPool(pool_size, max_retries, backoff_factor)
+        # Commands go over the server's persistent stream when it has one, see StreamChannel
+        self.use_stream = use_stream
+        self.streams = StreamChannelPool(self.CONNECT_TIMEOUT)
+        # Protect the game's frame time from scripts and loops that spam commands
+        self.rate_limiter = RateLimiter(rate_limit, burst)
+        self.coalescer = CommandCoalescer(coalesce)
+        self.interfaces = InterfaceSelector()
+        self.catalogue = CommandCatalogue()
+        self._completions: List[str] = []
+        self.metrics = CommandMetrics(export_path=metrics_file)
+        self.recorder = SessionRecorder(record_file)
+        self.quiet_period = quiet_period
+        self.first_n = first_n
+        # Output options for large results, see ResultRenderer
+        self.max_lines = max_lines
+        self.page = page
+        # Servers found by the last discovery, targets for BROADCAST
+        self.known_servers: List[Dict[str, str]] = []
+        
+        if use_registry:
+            self.ssdp_client.start_registry()
+        
+    def select_server(self, interactive: bool = True, use_cache: bool = True) -> bool:
+        """Reconnect to a cached server if one is alive, otherwise discover servers"""
+        if use_cache and self.connect_from_cache(interactive):
+            return True
+        
+        if not self.discover_and_select_server(interactive):
+            return False
+        
+        self.server_cache.save(self.known_servers, self.current_server)
+        return True
+    
+    def connect_from_cache(self, interactive: bool = True, timeout: float = 0.3) -> bool:
+        """Probe cached servers directly and use the most recently used one that answers"""
+        cached = self.server_cache.load()
+        if not cached:
+            return False
+        
+        start_time = time.perf_counter()
+        probes = [(index, ip) for index, server in enumerate(cached)
+                  for ip in server.get('all_ips') or [server['ip']]]
+        alive = {}
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(len(probes), 16))
+        try:
+            futures = {
+                executor.submit(self.probe_server, ip, cached[index]['port'], timeout): (index, ip)
+                for index, ip in probes
+            }
+            pending = [index for index, _ in probes]
+            for future in concurrent.futures.as_completed(futures):
+                index, ip = futures[future]
+                pending.remove(index)
+                # The first interface to answer wins for each server
+                if future.result() and index not in alive:
+                    alive[index] = ip
+                # Stop waiting once no more recently used server can still answer
+                if alive and (not pending or min(pending) > min(alive)):
+                    break
+        finally:
+            executor.shutdown(wait=False)
+        
+        if not alive:
+            logger.debug("No cached server is alive")
+            return False
+        
+        index = min(alive)
+        server = dict(cached[index])
+        server['ip'] = alive[index]
+        self.current_server = server
+        self.known_servers = [cached[i] for i in sorted(alive)]
+        
+        elapsed = (time.perf_counter() - start_time) * 1000
+        computer_name = server.get('computer_name', 'Unknown Computer')
+        print(f"⚡ Reconnected to GameMaster server: {computer_name} "
+              f"at {server['ip']}:{server['port']} ({elapsed:.0f} ms)")
+        
+        # Refresh the cache and the broadcast targets without blocking the user
+        refresh_thread = threading.Thread(target=self._refresh_known_servers)
+        refresh_thread.daemon = True
+        refresh_thread.start()
+        
+        if interactive:
+            self.show_commands()
+        return True
+    
+    @staticmethod
+    def probe_server(ip: str, port: int, timeout: float = 0.3) -> bool:
+        """Cheap health check against the server status endpoint"""
+        import requests
+        
+        try:
+            response = requests.get(f"http://{ip}:{port}/", timeout=timeout)
+            return response.status_code == 200 and response.json().get('Status') == 'Running'
+        except Exception:
+            return False
+    
+    def _refresh_known_servers(self):
+        """Run a full discovery in the background and remember its results"""
+        with self._discovery_lock:
+            servers = self.ssdp_client.discover_servers(3.0, None, self.quiet_period)
         
-    def discover_and_select_server(self) -> bool:
-        """Discover servers and let user select one"""
+        if servers:
+            self.known_servers = servers
+            self.server_cache.save(servers, self.current_server)
+    
+    def discover_and_select_server(self, interactive: bool = True) -> bool:
+        """Discover servers and let user select one, without prompts the first server is used"""
         print("🔍 Searching for GameMaster servers...")
         
+        # Drop pooled connections, interface measurements and commands of previously discovered servers
+        self.sessions.close()
+        self.streams.close()
+        self.interfaces.clear()
+        self.catalogue.invalidate()
+        
+        # Servers announced via NOTIFY are known without searching
+        servers = []
+        if self.ssdp_client.registry_running:
+            servers = self.ssdp_client.get_registry_servers()
+            if servers:
+                logger.debug(f"Using {len(servers)} server(s) from the SSDP registry")
+        
         # Start with short discovery, continue if no servers found
         search_time = 3.0
-        servers = []
         
         while not servers:
-            servers = self.ssdp_client.discover_servers(search_time)
+            with self._discovery_lock:
+                servers = self.ssdp_client.discover_servers(search_time, self.first_n, self.quiet_period)
+            
+            if not servers and not interactive:
+                print(f"No servers found in {search_time:.1f}s.")
+                return False
             
             if not servers:
                 print(f"No servers found in {search_time:.1f}s. Continuing search...")
@@ -266,6 +2409,8 @@ class GameMasterClient:
                 except KeyboardInterrupt:
                     print("\nSearch cancelled.")
                     return False
+        
+        self.known_servers = servers
             
         if len(servers) == 1:
             # Single server found
@@ -281,7 +2426,15 @@ class GameMasterClient:
                 print(f"✅ Found GameMaster server: {computer_name} "
                       f"at {server['ip']}:{server['port']}")
             
-            self.send_command("help", {})
+            if interactive:
+                self.show_commands()
+            return True
+            
+        elif len(servers) > 1 and not interactive:
+            self.current_server = servers[0]
+            computer_name = self.current_server.get('computer_name', 'Unknown Computer')
+            print(f"✅ Found {len(servers)} GameMaster servers, using {computer_name} "
+                  f"at {self.current_server['ip']}:{self.current_server['port']}")
             return True
             
         elif len(servers) > 1:
@@ -316,61 +2469,571 @@ class GameMasterClient:
                     
         return False
     
-    def send_command(self, command: str, args: List[str]) -> bool:
-        """Send command to the current server"""
-        if not self.current_server:
-            print("❌ No server selected. Use RESTART to discover servers.")
-            return False
-            
+    def connect(self, address: str):
+        """Use the server at "host[:port]" directly, skipping discovery"""
+        self.current_server = parse_server_address(address)
+    
+    def load_commands(self, server: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+        """Fetch the command catalogue of a server (the current one by default)"""
+        server = server or self.current_server
+        if not server:
+            return None
+        
+        ip = self.interfaces.select(server)
         try:
-            # Convert args to numbered dictionary format expected by server
-            arguments = {}
-            for i, arg in enumerate(args):
-                arguments[str(i)] = arg
-            
-            # Prepare request payload
-            payload = {
-                'Command': command,
-                'Arguments': arguments
-            }
-            
-            # Send HTTP POST request
-            url = f"http://{self.current_server['ip']}:{self.current_server['port']}/command"
-            headers = {'Content-Type': 'application/json'}
-            
-            response = requests.post(url, json=payload, headers=headers, timeout=10)
+            return self.catalogue.load(server, self.sessions.get(ip, server['port']), ip)
+        except Exception as e:
+            logger.debug(f"Error loading commands of {ip}:{server['port']}: {e}")
+            return None
+    
+    def get_commands(self, server: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+        """Get the command catalogue of a server, loading it on first use or after its commands changed"""
+        server = server or self.current_server
+        catalogue = self.catalogue.get(server)
+        if catalogue is None or catalogue['outdated']:
+            # Keep using the outdated list if the server cannot be asked right now
+            catalogue = self.load_commands(server) or catalogue
+        return catalogue
+    
+    def show_commands(self):
+        """Print the commands of the current server, asking the server only when they are not cached"""
+        catalogue = self.get_commands()
+        if not catalogue:
+            self.send_command("help", {})
+            return
+        
+        print("✅ List of commands:")
+        for name in catalogue['names']:
+            command, description = catalogue['commands'][name]
+            print(f"   {command} - {description}" if description else f"   {command}")
+    
+    def is_known_command(self, command: str, server: Optional[Dict[str, str]] = None) -> bool:
+        """Check a command against the server's catalogue, unknown catalogues accept everything"""
+        server = server or self.current_server
+        catalogue = self.catalogue.get(server)
+        if catalogue is None or command.lower() in catalogue['commands']:
+            return True
+        
+        # The command may have been registered since the catalogue was loaded
+        if self.catalogue.is_stale(catalogue):
+            catalogue = self.load_commands(server)
+            return catalogue is None or command.lower() in catalogue['commands']
+        return False
+    
+    def send_command(self, command: str, args: List[str], output_file: Optional[str] = None) -> bool:
+        """Send command to the current server, large results are printed while they arrive"""
+        renderer = self.create_renderer(output_file)
+        result = self.execute_command(command, args, renderer=renderer)
+        self.print_streamed_result(result, renderer)
+        return result.delivered
+    
+    def create_renderer(self, output_file: Optional[str] = None) -> ResultRenderer:
+        """Renderer for one command result, following the client's output options"""
+        return ResultRenderer(self.max_lines, self.page, output_file)
+    
+    def print_streamed_result(self, result: CommandResult, renderer: ResultRenderer):
+        """Print what the renderer did not print while streaming"""
+        if not renderer.rendered or result.error:
+            self.print_result(result)
+    
+    def execute_command(self, command: str, args: List[str], server: Optional[Dict[str, str]] = None,
+                        renderer: Optional[ResultRenderer] = None) -> CommandResult:
+        """Send command to a server (the current one by default) and return the outcome,
+        with a renderer large results are printed as they arrive instead of being kept"""
+        server = server or self.current_server
+        result = CommandResult(command=command, args=list(args))
+        if not server:
+            result.error = "No server selected. Use RESTART to discover servers."
+            return result
+        
+        if not self.is_known_command(command, server):
+            result.error = f"Unknown command '{command}'. Type help to list available commands."
+            return result
+        
+        key = self.coalescer.key_for(server, command, args)
+        if key is not None:
+            return self.coalescer.run(key, args,
+                                      lambda merged_args: self._send_command(command, merged_args, server, renderer),
+                                      lambda: self.rate_limiter.acquire(server))
+        
+        self.rate_limiter.acquire(server)
+        return self._send_command(command, args, server, renderer)
+    
+    def _send_command(self, command: str, args: List[str], server: Dict[str, str],
+                      renderer: Optional[ResultRenderer] = None) -> CommandResult:
+        """Send an accepted command over the command stream or HTTP and record its outcome"""
+        import requests
+        
+        result = CommandResult(command=command, args=list(args))
+        ip = self.interfaces.select(server)
+        result.server = f"{ip}:{server['port']}"
+        _connect_timing.elapsed = 0.0
+        start_time = time.perf_counter()
+        try:
+            payload = self._build_payload(command, args)
             
-            if response.status_code == 200:
-                try:
-                    result = response.json()
-                    if result.get('Success', False):
-                        print(f"✅ {result.get('Message', 'Command executed successfully')}")
-                        
-                        # Show additional result data if available
-                        data = result.get('Data', {})
-                        if data:
-                            for key, value in data.items():
-                                if key not in ['command', 'arguments', 'timestamp', 'status']:
-                                    print(f"   {key}: {value}")
-                    else:
-                        print(f"❌ Command failed: {result.get('Message', 'Unknown error')}")
-                except json.JSONDecodeError:
-                    print(f"✅ Command sent successfully. Response: {response.text}")
-                    
-                return True
+            # Only HTTP delivers a response while it arrives, a stream answer is one whole frame
+            if (self.use_stream and not (renderer and renderer.streams_everything())
+                    and self._execute_on_stream(result, server, ip, payload, renderer)):
+                pass
             else:
-                print(f"❌ Server error ({response.status_code}): {response.text}")
-                return False
+                # Send HTTP POST request
+                # Another interface is tried instead of retrying the connect, so failover stays within a timeout
+                connect_retries = 0 if len(server.get('all_ips') or []) > 1 else None
+                while True:
+                    url = f"http://{ip}:{server['port']}/command"
+                    session = self.sessions.get(ip, server['port'], connect_retries)
+                    try:
+                        response = session.post(url, json=payload, timeout=(self.CONNECT_TIMEOUT, 10),
+                                                stream=renderer is not None)
+                        break
+                    except requests.exceptions.ConnectionError as e:
+                        # Safe to resend on another interface only if the request never left
+                        next_ip = self.interfaces.report_failure(server, ip) if self._is_connect_failure(e) else None
+                        if not next_ip or next_ip == ip:
+                            raise
+                        ip = next_ip
+                        result.server = f"{ip}:{server['port']}"
+                
+                self.catalogue.check_version(server, response.headers.get(CommandCatalogue.VERSION_HEADER))
+                if renderer and renderer.wants(response.status_code, response.headers.get('Content-Length')):
+                    self._read_response_head(result, response.status_code, response.headers)
+                    renderer.render(result, response.iter_content(ResultRenderer.CHUNK_SIZE))
+                else:
+                    self._read_response(result, response.status_code, response.headers, response.text)
                 
         except requests.exceptions.ConnectionError:
-            print(f"❌ Cannot connect to server {self.current_server['ip']}:{self.current_server['port']}")
-            return False
+            result.error = f"Cannot connect to server {result.server}"
         except requests.exceptions.Timeout:
-            print("❌ Request timeout. Server may be busy.")
-            return False
+            result.error = "Request timeout. Server may be busy."
         except Exception as e:
-            print(f"❌ Error sending command: {e}")
+            result.error = f"Error sending command: {e}"
+        finally:
+            result.elapsed = time.perf_counter() - start_time
+            result.connect_time = result.connect_time or _connect_timing.elapsed
+        
+        self.metrics.record(result)
+        self.recorder.record(result)
+        return result
+    
+    def execute_once(self, command: str, args: List[str],
+                     renderer: Optional[ResultRenderer] = None) -> CommandResult:
+        """Send a single command to the current server over a plain socket, for one-shot runs"""
+        server = self.current_server
+        result = CommandResult(command=command, args=list(args), server=f"{server['ip']}:{server['port']}")
+        start_time = time.perf_counter()
+        try:
+            body = json.dumps(self._build_payload(command, args)).encode('utf-8')
+            status_code, headers, chunks = self._post_once(server['ip'], server['port'], '/command', body)
+            if renderer and renderer.wants(status_code, headers.get('content-length')):
+                self._read_response_head(result, status_code, headers)
+                renderer.render(result, chunks)
+            else:
+                text = b''.join(chunks).decode('utf-8', errors='replace')
+                self._read_response(result, status_code, headers, text)
+        except socket.timeout:
+            result.error = "Request timeout. Server may be busy."
+        except OSError:
+            result.error = f"Cannot connect to server {result.server}"
+        except Exception as e:
+            result.error = f"Error sending command: {e}"
+        finally:
+            result.elapsed = time.perf_counter() - start_time
+        
+        self.metrics.record(result)
+        self.recorder.record(result)
+        return result
+    
+    @staticmethod
+    def _post_once(ip: str, port: int, path: str, body: bytes,
+                   timeout: float = 10.0) -> Tuple[int, Dict[str, str], Iterator[bytes]]:
+        """Minimal HTTP/1.1 POST on a new connection, returns status, lower-cased headers and body chunks"""
+        # Loading requests, or even http.client with its email and ssl imports, takes
+        # longer than sending the command, and a single request gains nothing from them
+        request = (
+            f"POST {path} HTTP/1.1\r\n"
+            f"Host: {ip}:{port}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n"
+            "\r\n"
+        ).encode('ascii') + body
+        
+        sock = socket.create_connection((ip, port), timeout=timeout)
+        try:
+            sock.sendall(request)
+            data = b''
+            while b'\r\n\r\n' not in data:
+                chunk = sock.recv(ResultRenderer.CHUNK_SIZE)
+                if not chunk:
+                    raise ConnectionError("Connection closed before the response arrived")
+                data += chunk
+        except BaseException:
+            sock.close()
+            raise
+        
+        head, _, payload = data.partition(b'\r\n\r\n')
+        lines = head.decode('iso-8859-1').split('\r\n')
+        status_code = int(lines[0].split()[1])
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        content_length = int(headers['content-length']) if 'content-length' in headers else None
+        
+        def read_body() -> Iterator[bytes]:
+            """Body chunks as they arrive, the connection is closed once all were read"""
+            try:
+                received = len(payload)
+                if payload:
+                    yield payload
+                while content_length is None or received < content_length:
+                    chunk = sock.recv(ResultRenderer.CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    received += len(chunk)
+                    yield chunk
+            finally:
+                sock.close()
+        
+        return status_code, headers, read_body()
+    
+    def _execute_on_stream(self, result: CommandResult, server: Dict[str, str], ip: str,
+                           payload: Dict[str, Any], renderer: Optional[ResultRenderer] = None) -> bool:
+        """Send a command over the server's command stream, returns False if it must go over HTTP"""
+        # The status endpoint advertises the stream, it is read once along with the command list
+        catalogue = self.get_commands(server)
+        stream_port = catalogue.get('stream_port') if catalogue else None
+        if not stream_port:
+            return False
+        
+        channel = self.streams.get(ip, stream_port)
+        if channel is None:
+            return False
+        if channel.requests == 0:
+            result.connect_time = channel.connect_time
+        
+        try:
+            response, frame = channel.request(payload, timeout=10, stream_large=renderer is not None)
+            if response is None:
+                # A large answer, printed while it arrives like a large HTTP response
+                try:
+                    renderer.render(result, frame)
+                finally:
+                    for _ in frame:
+                        pass
+                self.catalogue.check_version(server, renderer.fields.get('CommandsVersion'))
+                result.server_queue_time = self._timing_field(renderer.fields, 'QueueMs')
+                result.server_execute_time = self._timing_field(renderer.fields, 'ExecuteMs')
+                return True
+        except BrokenPipeError as e:
+            # Nothing was sent, HTTP still works if only the stream broke
+            logger.debug(f"Falling back to HTTP for {ip}:{server['port']}: {e}")
+            return False
+        except socket.timeout:
+            result.error = "Request timeout. Server may be busy."
+            return True
+        except ConnectionResetError:
+            # The command may have run, so it is not sent again
+            result.error = f"Connection to server {ip}:{stream_port} lost"
+            return True
+        
+        self.catalogue.check_version(server, response.get('CommandsVersion'))
+        result.server_queue_time = self._timing_field(response, 'QueueMs')
+        result.server_execute_time = self._timing_field(response, 'ExecuteMs')
+        if response.get('Error'):
+            result.error = f"Server error: {response['Error']}"
+        else:
+            result.delivered = True
+            result.success = bool(response.get('Success', False))
+            result.message = response.get('Message', '')
+            result.data = response.get('Data') or {}
+        return True
+    
+    @staticmethod
+    def _timing_field(response: Dict[str, Any], name: str) -> Optional[float]:
+        """Read a server timing in milliseconds from a stream answer as seconds"""
+        value = response.get(name)
+        return float(value) / 1000.0 if isinstance(value, (int, float)) else None
+    
+    @staticmethod
+    def _build_payload(command: str, args: List[str]) -> Dict[str, Any]:
+        """Convert args to the numbered dictionary format expected by the server"""
+        arguments = {}
+        for i, arg in enumerate(args):
+            arguments[str(i)] = arg
+        
+        return {
+            'Command': command,
+            'Arguments': arguments
+        }
+    
+    def _read_response_head(self, result: CommandResult, status_code: int, headers: Any):
+        """Fill the status and server timings of a command result"""
+        result.status_code = status_code
+        result.server_queue_time = self._timing_header(headers, 'X-GM-Queue-Ms')
+        result.server_execute_time = self._timing_header(headers, 'X-GM-Execute-Ms')
+    
+    def _read_response(self, result: CommandResult, status_code: int, headers: Any, text: str):
+        """Fill a command result from the server's HTTP response"""
+        self._read_response_head(result, status_code, headers)
+        
+        if status_code == 200:
+            result.delivered = True
+            try:
+                body = json.loads(text)
+                result.success = bool(body.get('Success', False))
+                result.message = body.get('Message', '')
+                result.data = body.get('Data') or {}
+            except ValueError:
+                # Not a JSON answer, but the command was accepted
+                result.success = True
+                result.raw = text
+        else:
+            result.error = f"Server error ({status_code}): {text}"
+    
+    @staticmethod
+    def _is_connect_failure(error: requests.exceptions.ConnectionError) -> bool:
+        """Check whether a request failed before anything was sent to the server"""
+        import requests
+        import urllib3
+        
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+        return isinstance(reason, (urllib3.exceptions.NewConnectionError, urllib3.exceptions.ConnectTimeoutError))
+    
+    @staticmethod
+    def _timing_header(headers: Any, name: str) -> Optional[float]:
+        """Read a server timing header in milliseconds as seconds"""
+        # Lower-cased lookups work for requests' case-insensitive headers and plain dicts alike
+        value = headers.get(name.lower())
+        try:
+            return float(value) / 1000.0 if value is not None else None
+        except ValueError:
+            return None
+    
+    def print_result(self, result: CommandResult, prefix: str = ""):
+        """Print command outcome in the console format"""
+        if result.error:
+            print(f"{prefix}❌ {result.error}")
+        elif result.raw is not None:
+            print(f"{prefix}✅ Command sent successfully. Response: {result.raw}")
+        elif result.success:
+            print(f"{prefix}✅ {result.message or 'Command executed successfully'}")
+            
+            # Show additional result data if available
+            for key, value in result.data.items():
+                if key not in ['command', 'arguments', 'timestamp', 'status']:
+                    print(f"{prefix}   {key}: {value}")
+        else:
+            print(f"{prefix}❌ Command failed: {result.message or 'Unknown error'}")
+    
+    def find_servers(self, search_time: float = 3.0) -> List[Dict[str, str]]:
+        """Find all reachable servers without prompting, from the registry when it knows any"""
+        servers = []
+        if self.ssdp_client.registry_running:
+            servers = self.ssdp_client.get_registry_servers()
+        if not servers:
+            with self._discovery_lock:
+                servers = self.ssdp_client.discover_servers(search_time, None, self.quiet_period)
+        
+        self.known_servers = servers
+        self.server_cache.save(servers)
+        return servers
+    
+    def broadcast(self, command: str, args: List[str],
+                  servers: List[Dict[str, str]]) -> List[Tuple[Dict[str, str], CommandResult]]:
+        """Send the same command to all given servers in parallel"""
+        if not servers:
+            return []
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(servers)) as executor:
+            futures = [executor.submit(self.execute_command, command, args, server) for server in servers]
+            return [(server, future.result()) for server, future in zip(servers, futures)]
+    
+    def print_broadcast_results(self, results: List[Tuple[Dict[str, str], CommandResult]], elapsed: float):
+        """Print per-server broadcast results as one table"""
+        rows = []
+        for server, result in sorted(results, key=lambda item: item[0].get('computer_name', '').lower()):
+            if result.error:
+                outcome, message = "❌", result.error
+            elif result.success:
+                outcome, message = "✅", result.message or result.raw or 'Command executed successfully'
+            else:
+                outcome, message = "❌", result.message or 'Unknown error'
+            
+            rows.append((
+                server.get('computer_name', '') or 'Unknown',
+                result.server,
+                outcome,
+                f"{result.elapsed * 1000:.0f} ms",
+                message.splitlines()[0] if message else ''
+            ))
+        
+        headers = ("Server", "Address", "", "Latency", "Message")
+        widths = [max(len(str(row[i])) for row in rows + [headers]) for i in range(len(headers) - 1)]
+        
+        for row in [headers] + rows:
+            print("  ".join(str(cell).ljust(width) for cell, width in zip(row, widths)) + "  " + row[-1])
+        
+        succeeded = sum(1 for _, result in results if result.success)
+        slowest = max(result.elapsed for _, result in results)
+        print(f"📡 {succeeded}/{len(results)} servers succeeded in {elapsed * 1000:.0f} ms "
+              f"(slowest {slowest * 1000:.0f} ms)")
+    
+    def run_broadcast(self, command: str, args: List[str], servers: List[Dict[str, str]]) -> bool:
+        """Broadcast a command and print the aggregated results"""
+        if not servers:
+            print("❌ No servers to broadcast to.")
+            return False
+        
+        start_time = time.perf_counter()
+        results = self.broadcast(command, args, servers)
+        self.print_broadcast_results(results, time.perf_counter() - start_time)
+        return all(result.success for _, result in results)
+    
+    def run_script(self, lines: Iterable[str], window: int = 8, ordered: bool = True) -> bool:
+        """Send commands from script lines with up to `window` requests in flight"""
+        if not self.current_server:
+            print("❌ No server selected.")
             return False
+        
+        succeeded = 0
+        failures = []
+        start_time = time.perf_counter()
+        
+        def report(line_number: int, result: CommandResult):
+            nonlocal succeeded
+            self.print_result(result, prefix=f"[{line_number}] {result.command}: ")
+            if result.success:
+                succeeded += 1
+            else:
+                failures.append(line_number)
+        
+        window = max(1, window)
+        finished: Dict[int, CommandResult] = {}
+        submitted = collections.deque()
+        # Guards the result tables and keeps reports from interleaving
+        report_lock = threading.Lock()
+        free_slots = threading.Semaphore(window)
+        
+        def completed(line_number: int, parts: List[str], future: concurrent.futures.Future):
+            # Runs as soon as a command finishes, even while the next script line is still being read
+            try:
+                result = future.result()
+            except Exception as e:
+                result = CommandResult(command=parts[0], args=parts[1:], error=f"Error sending command: {e}")
+            
+            with report_lock:
+                finished[line_number] = result
+                if ordered:
+                    # Hold results back until everything submitted before them is reported
+                    while submitted and submitted[0] in finished:
+                        line_number = submitted.popleft()
+                        report(line_number, finished.pop(line_number))
+                else:
+                    report(line_number, finished.pop(line_number))
+            free_slots.release()
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=window) as executor:
+            for line_number, line in enumerate(lines, 1):
+                parts = line.split()
+                if not parts or parts[0].startswith('#'):
+                    continue
+                if parts[0] == 'EXIT':
+                    break
+                
+                free_slots.acquire()
+                with report_lock:
+                    submitted.append(line_number)
+                future = executor.submit(self.execute_command, parts[0], parts[1:])
+                future.add_done_callback(lambda done, line_number=line_number, parts=parts:
+                                         completed(line_number, parts, done))
+        
+        elapsed = time.perf_counter() - start_time
+        total = succeeded + len(failures)
+        throughput = total / elapsed if elapsed > 0 else 0.0
+        
+        print("=" * 40)
+        print(f"📋 {total} commands in {elapsed:.2f}s ({throughput:.1f} cmd/s): "
+              f"{succeeded} succeeded, {len(failures)} failed")
+        if failures:
+            shown = ', '.join(str(n) for n in sorted(failures)[:20])
+            more = f" (+{len(failures) - 20} more)" if len(failures) > 20 else ""
+            print(f"   Failed lines: {shown}{more}")
+        
+        return not failures
+    
+    def show_stats(self):
+        """Print connection reuse and latency statistics for all servers"""
+        stats = self.sessions.stats()
+        if not stats:
+            print("No connections opened yet.")
+            return
+        
+        print("📊 Connection statistics:")
+        for address, requests_sent in self.streams.stats().items():
+            print(f"   {address}: {requests_sent} commands over the command stream")
+        for address, counters in stats.items():
+            print(f"   {address}: {counters['requests']} requests, "
+                  f"{counters['connections']} connections opened, "
+                  f"{counters['reused']} reused")
+        
+        round_trip_times = self.interfaces.round_trip_times(self.current_server) if self.current_server else {}
+        if round_trip_times:
+            active = self.interfaces.active(self.current_server)
+            print("🌐 Interfaces:")
+            for ip, rtt in round_trip_times.items():
+                status = f"{rtt * 1000:.2f} ms" if rtt is not None else "unreachable"
+                marker = " (active)" if ip == active else ""
+                print(f"   {ip}: {status}{marker}")
+        
+        if self.coalescer.merged or self.rate_limiter.throttled:
+            print(f"🧮 {self.coalescer.merged} commands coalesced, {self.rate_limiter.throttled} held back "
+                  f"by the rate limit for {self.rate_limiter.throttled_time:.2f}s in total")
+        
+        rows = self.metrics.summary()
+        if not rows:
+            return
+        
+        print(f"⏱️  Latency over the last {self.metrics.window:.0f}-{2 * self.metrics.window:.0f}s (ms):")
+        print(f"   {'Server':<22} {'Phase':<8} {'Count':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'Max':>8}")
+        for server, phase, count, p50, p95, p99, maximum in rows:
+            print(f"   {server:<22} {phase:<8} {count:>6} {p50 * 1000:>8.2f} {p95 * 1000:>8.2f} "
+                  f"{p99 * 1000:>8.2f} {maximum * 1000:>8.2f}")
+    
+    def setup_completion(self):
+        """Complete client and server commands with the Tab key"""
+        try:
+            import readline
+        except ImportError:
+            # Not available on Windows, the client works without tab completion there
+            return
+        
+        readline.set_completer(self._complete)
+        readline.set_completer_delims(' \t')
+        if 'libedit' in (readline.__doc__ or ''):
+            # macOS ships readline emulated on top of libedit
+            readline.parse_and_bind("bind ^I rl_complete")
+        else:
+            readline.parse_and_bind("tab: complete")
+    
+    def _complete(self, text: str, state: int) -> Optional[str]:
+        """Readline completer for the command name, also after BROADCAST"""
+        import readline
+        
+        words = readline.get_line_buffer()[:readline.get_begidx()].split()
+        if state == 0:
+            self._completions = []
+            if not words or words == ['BROADCAST']:
+                if not words:
+                    self._completions = [name for name in self.CLIENT_COMMANDS if name.startswith(text)]
+                catalogue = self.get_commands() if self.current_server else None
+                if catalogue:
+                    self._completions += CommandCatalogue.complete(catalogue, text)
+        
+        return self._completions[state] if state < len(self._completions) else None
     
     def run(self):
         """Main application loop"""
@@ -379,13 +3042,17 @@ class GameMasterClient:
         print("Commands:")
         print("  EXIT     - Close application")
         print("  RESTART  - Restart server discovery")
+        print("  STATS    - Show connection and latency statistics")
+        print("  BROADCAST <CMD> <ARGS> - Send command to all discovered servers")
         print("  <CMD> <ARGS> - Send command to server")
         print("=" * 40)
         
-        # Initial server discovery
-        if not self.discover_and_select_server():
+        # Initial server discovery, unless a server was given on the command line
+        if not self.current_server and not self.select_server():
             print("No servers available. Exiting.")
             return
+        
+        self.setup_completion()
             
         # Main command loop
         while True:
@@ -393,7 +3060,8 @@ class GameMasterClient:
                 # Get command input
                 if self.current_server:
                     computer_name = self.current_server.get('computer_name', 'Unknown')
-                    prompt = f"GM[{computer_name}@{self.current_server['ip']}:{self.current_server['port']}]> "
+                    ip = self.interfaces.active(self.current_server)
+                    prompt = f"GM[{computer_name}@{ip}:{self.current_server['port']}]> "
                 else:
                     prompt = "GM[No Server]> "
                     
@@ -404,6 +3072,13 @@ class GameMasterClient:
                     
                 # Parse command and arguments
                 parts = user_input.split()
+                
+                # "CMD ARGS > FILE" saves the raw result instead of printing it
+                output_file = None
+                if len(parts) > 2 and parts[-2] == '>':
+                    output_file = parts[-1]
+                    parts = parts[:-2]
+                
                 command = parts[0]
                 args = parts[1:] if len(parts) > 1 else []
                 
@@ -411,14 +3086,23 @@ class GameMasterClient:
                 if command == 'EXIT':
                     print("👋 Goodbye!")
                     break
+                elif command == 'STATS':
+                    self.show_stats()
+                elif command.lower() == 'help' and not args and self.current_server:
+                    self.show_commands()
+                elif command == 'BROADCAST':
+                    if args:
+                        self.run_broadcast(args[0], args[1:], self.known_servers)
+                    else:
+                        print("Usage: BROADCAST <CMD> <ARGS>")
                 elif command == 'RESTART':
                     print("🔄 Restarting server discovery...")
-                    if not self.discover_and_select_server():
+                    if not self.select_server(use_cache=False):
                         print("No servers available.")
                         self.current_server = None
                 else:
                     # Send command to server
-                    self.send_command(command, args)
+                    self.send_command(command, args, output_file)
                     
             except KeyboardInterrupt:
                 print("\n👋 Goodbye!")
@@ -426,12 +3110,605 @@ class GameMasterClient:
             except EOFError:
                 print("\n👋 Goodbye!")
                 break
+        
+        self.sessions.close()
+        self.streams.close()
+        self.interfaces.stop()
+        self.metrics.close()
+        self.recorder.close()
+        self.ssdp_client.stop_registry()
+
+
+class LoadGenerator:
+    """Drives a weighted command mix against one server at a target rate or concurrency"""
+    
+    def __init__(self, client: GameMasterClient, server: Dict[str, str],
+                 mix: List[Tuple[str, List[str], float]], max_in_flight: int = 64):
+        self.client = client
+        self.server = server
+        self.mix = mix
+        self.max_in_flight = max_in_flight
+        self._weights = [weight for _, _, weight in mix]
+    
+    def _next_command(self) -> Tuple[str, List[str]]:
+        command, args, _ = random.choices(self.mix, weights=self._weights)[0]
+        return command, args
+    
+    def run_step(self, duration: float, rate: Optional[float] = None,
+                 concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """Run one load level for `duration` seconds and return its statistics"""
+        # Rolling windows are not wanted here, the histogram covers the whole step
+        histogram = LatencyHistogram(window=float('inf'))
+        counters = collections.Counter()
+        lock = threading.Lock()
+        
+        def record(result: CommandResult, latency: float):
+            with lock:
+                histogram.record(latency)
+                counters['completed'] += 1
+                if not result.success:
+                    counters['errors'] += 1
+        
+        start_time = time.perf_counter()
+        deadline = start_time + duration
+        
+        if rate:
+            self._run_open_loop(rate, deadline, record, counters, lock)
+        else:
+            self._run_closed_loop(concurrency or 1, deadline, record)
+        
+        elapsed = time.perf_counter() - start_time
+        completed = counters['completed']
+        return {
+            'target': rate if rate else concurrency or 1,
+            'completed': completed,
+            'errors': counters['errors'],
+            'skipped': counters['skipped'],
+            'throughput': completed / elapsed if elapsed > 0 else 0.0,
+            'error_rate': counters['errors'] / completed if completed else 0.0,
+            'p50': histogram.percentile(50),
+            'p95': histogram.percentile(95),
+            'p99': histogram.percentile(99),
+            'max': histogram.max
+        }
+    
+    def _run_closed_loop(self, concurrency: int, deadline: float, record):
+        """Keep `concurrency` commands in flight, each worker sends the next one as soon as it is answered"""
+        def worker():
+            while time.perf_counter() < deadline:
+                command, args = self._next_command()
+                sent_at = time.perf_counter()
+                result = self.client.execute_command(command, args, self.server)
+                record(result, time.perf_counter() - sent_at)
+        
+        workers = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+    
+    def _run_open_loop(self, rate: float, deadline: float, record, counters: collections.Counter,
+                       lock: threading.Lock):
+        """Send commands on a fixed schedule regardless of how fast the server answers"""
+        interval = 1.0 / rate
+        in_flight = threading.Semaphore(self.max_in_flight)
+        
+        def send(command: str, args: List[str], scheduled_at: float):
+            try:
+                result = self.client.execute_command(command, args, self.server)
+                # Measured from the scheduled time, so falling behind shows up as latency
+                record(result, time.perf_counter() - scheduled_at)
+            finally:
+                in_flight.release()
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            scheduled_at = time.perf_counter()
+            while scheduled_at < deadline:
+                delay = scheduled_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                
+                if in_flight.acquire(blocking=False):
+                    command, args = self._next_command()
+                    executor.submit(send, command, args, scheduled_at)
+                else:
+                    with lock:
+                        counters['skipped'] += 1
+                
+                scheduled_at += interval
+    
+    def run(self, duration: float, rate: Optional[float] = None, concurrency: Optional[int] = None,
+            ramp_steps: int = 1) -> List[Dict[str, Any]]:
+        """Ramp the load up in equal steps, stopping early once the server is saturated"""
+        steps = []
+        ramp_steps = max(1, ramp_steps)
+        for step in range(1, ramp_steps + 1):
+            if rate:
+                stats = self.run_step(duration, rate=rate * step / ramp_steps)
+            else:
+                stats = self.run_step(duration, concurrency=max(1, round((concurrency or 1) * step / ramp_steps)))
+            
+            stats['saturated'] = self._is_saturated(stats, steps, rate is not None)
+            steps.append(stats)
+            self.print_step(step, stats, rate is not None)
+            
+            if stats['saturated']:
+                break
+        
+        return steps
+    
+    @staticmethod
+    def _is_saturated(stats: Dict[str, Any], previous: List[Dict[str, Any]], rate_mode: bool) -> bool:
+        """Whether the server stopped keeping up with the offered load"""
+        if stats['error_rate'] > 0.01:
+            return True
+        if rate_mode:
+            return stats['throughput'] < 0.9 * stats['target'] or stats['skipped'] > 0
+        if previous:
+            # More concurrency no longer buys throughput, it only adds queueing
+            return stats['throughput'] < 1.05 * previous[-1]['throughput']
+        return False
+    
+    @staticmethod
+    def print_step(step: int, stats: Dict[str, Any], rate_mode: bool):
+        if step == 1:
+            target = "Rate" if rate_mode else "Workers"
+            print(f"{'Step':>4} {target:>8} {'Achieved':>9} {'Errors':>7} {'Skipped':>8} "
+                  f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'Max ms':>8}")
+        
+        target = f"{stats['target']:.1f}" if rate_mode else str(stats['target'])
+        print(f"{step:>4} {target:>8} {stats['throughput']:>9.1f} {stats['errors']:>7} {stats['skipped']:>8} "
+              f"{stats['p50'] * 1000:>8.2f} {stats['p95'] * 1000:>8.2f} {stats['p99'] * 1000:>8.2f} "
+              f"{stats['max'] * 1000:>8.2f}" + ("  ⚠️ saturated" if stats['saturated'] else ""))
+
+
+class SessionReplayer:
+    """Plays a recorded session back against one server, on the original schedule or as fast as possible"""
+    
+    def __init__(self, client: GameMasterClient, server: Dict[str, str], entries: List[Dict[str, Any]]):
+        self.client = client
+        self.server = server
+        self.entries = entries
+    
+    def run(self, speed: float = 1.0, window: int = 8) -> Dict[str, Any]:
+        """Replay all commands with up to `window` in flight, speed 0 sends them without waiting,
+        otherwise the recorded gaps are divided by `speed`"""
+        window = max(1, window)
+        latency = LatencyHistogram(window=float('inf'))
+        recorded = LatencyHistogram(window=float('inf'))
+        lag = LatencyHistogram(window=float('inf'))
+        counters = collections.Counter()
+        lock = threading.Lock()
+        in_flight = threading.Semaphore(window)
+        
+        def send(index: int, entry: Dict[str, Any]):
+            try:
+                result = self.client.execute_command(entry['command'], entry.get('args', []), self.server)
+            finally:
+                in_flight.release()
+            with lock:
+                latency.record(result.elapsed)
+                if entry.get('elapsed_ms') is not None:
+                    recorded.record(entry['elapsed_ms'] / 1000.0)
+                counters['completed'] += 1
+                if not result.success:
+                    counters['errors'] += 1
+                # Same command, different outcome: the build or the setup changed behaviour
+                if result.success != entry.get('success', result.success):
+                    counters['changed'] += 1
+                    outcome = "now succeeds" if result.success else "now fails"
+                    self.client.print_result(result, prefix=f"[{index}] {result.command} ({outcome}): ")
+                elif not result.success:
+                    self.client.print_result(result, prefix=f"[{index}] {result.command}: ")
+        
+        start_time = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=window) as executor:
+            for index, entry in enumerate(self.entries, 1):
+                due = start_time + entry['offset'] / speed if speed else None
+                if due is not None:
+                    delay = due - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                
+                # A full window holds the schedule back, which shows up as lag
+                in_flight.acquire()
+                if due is not None:
+                    lag.record(max(time.perf_counter() - due, 0.0))
+                executor.submit(send, index, entry)
+        
+        elapsed = time.perf_counter() - start_time
+        completed = counters['completed']
+        return {
+            'completed': completed,
+            'errors': counters['errors'],
+            'changed': counters['changed'],
+            'elapsed': elapsed,
+            'recorded_elapsed': self.entries[-1]['offset'] if self.entries else 0.0,
+            'throughput': completed / elapsed if elapsed > 0 else 0.0,
+            'p50': latency.percentile(50),
+            'p99': latency.percentile(99),
+            'recorded_p50': recorded.percentile(50) if recorded.count else None,
+            'recorded_p99': recorded.percentile(99) if recorded.count else None,
+            'lag_p99': lag.percentile(99) if lag.count else None,
+            'lag_max': lag.max if lag.count else None
+        }
+    
+    @staticmethod
+    def print_summary(stats: Dict[str, Any]):
+        print("=" * 40)
+        print(f"🎬 {stats['completed']} commands in {stats['elapsed']:.2f}s "
+              f"(recorded {stats['recorded_elapsed']:.2f}s, {stats['throughput']:.1f} cmd/s): "
+              f"{stats['completed'] - stats['errors']} succeeded, {stats['errors']} failed, "
+              f"{stats['changed']} changed outcome")
+        line = f"   Latency p50 {stats['p50'] * 1000:.2f} ms, p99 {stats['p99'] * 1000:.2f} ms"
+        if stats['recorded_p50'] is not None:
+            line += (f" (recorded p50 {stats['recorded_p50'] * 1000:.2f} ms, "
+                     f"p99 {stats['recorded_p99'] * 1000:.2f} ms)")
+        print(line)
+        if stats['lag_p99'] is not None:
+            print(f"   Schedule lag p99 {stats['lag_p99'] * 1000:.2f} ms, max {stats['lag_max'] * 1000:.2f} ms")
+
+
+def parse_command_mix(entries: Optional[List[str]]) -> List[Tuple[str, List[str], float]]:
+    """Parse "[WEIGHT:]COMMAND ARG..." entries into a weighted command mix"""
+    mix = []
+    for entry in entries or ['help']:
+        weight = 1.0
+        match = re.match(r'^\s*(\d+(?:\.\d+)?)\s*:(.*)$', entry)
+        if match:
+            weight, entry = float(match.group(1)), match.group(2)
+        
+        parts = entry.split()
+        if parts:
+            mix.append((parts[0], parts[1:], weight))
+    return mix
+
+
+def coalesce_entry(value: str) -> str:
+    """Argument type of --coalesce, rejects malformed entries before the client is built"""
+    try:
+        CommandCoalescer.parse_entry(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return value
+
+
+def run_load_test(client: GameMasterClient, args: argparse.Namespace) -> bool:
+    """Run the load generator against the selected server and print a summary"""
+    if not client.current_server and not client.select_server(interactive=False):
+        return False
+    
+    mix = parse_command_mix(args.load_command)
+    if not mix:
+        print("❌ Empty command mix.")
+        return False
+    
+    mode = f"{args.rate:.1f} cmd/s" if args.rate else f"{args.concurrency} concurrent workers"
+    print(f"🚀 Load test: {mode}, {args.ramp_steps} step(s) of {args.duration:g}s, "
+          f"mix: {', '.join(command for command, _, _ in mix)}")
+    
+    generator = LoadGenerator(client, client.current_server, mix, args.max_in_flight)
+    steps = generator.run(args.duration, args.rate, args.concurrency, args.ramp_steps)
+    
+    saturated = next((index for index, stats in enumerate(steps) if stats['saturated']), None)
+    if saturated is None:
+        best = max(steps, key=lambda stats: stats['throughput'])
+        print(f"📈 No saturation detected, best throughput {best['throughput']:.1f} cmd/s")
+    elif saturated == 0:
+        print("📉 Server saturated at the first step, try a lower starting load")
+    else:
+        last_good = steps[saturated - 1]
+        print(f"📉 Saturation point: ~{last_good['throughput']:.1f} cmd/s "
+              f"(p99 {last_good['p99'] * 1000:.1f} ms before degrading)")
+    
+    return all(stats['errors'] == 0 for stats in steps)
+
+
+def run_replay(client: GameMasterClient, args: argparse.Namespace) -> bool:
+    """Replay a recorded session against the selected server and print how it compares"""
+    try:
+        entries = SessionRecorder.load(args.replay)
+    except OSError as e:
+        print(f"❌ Cannot read session log: {e}")
+        return False
+    if not entries:
+        print(f"❌ No commands recorded in {args.replay}.")
+        return False
+    
+    if not client.current_server and not client.select_server():
+        return False
+    
+    speed = f"{args.speed:g}x speed" if args.speed else "max speed"
+    print(f"🎬 Replaying {len(entries)} commands from {args.replay} at {speed}, "
+          f"up to {args.window} in flight")
+    
+    replayer = SessionReplayer(client, client.current_server, entries)
+    stats = replayer.run(args.speed, args.window)
+    replayer.print_summary(stats)
+    # Commands that failed in the recording are expected to fail again
+    return stats['changed'] == 0
+
+
+def run_monitor(client: GameMasterClient, args: argparse.Namespace):
+    """Watch all known servers and redraw their health table until Ctrl+C"""
+    monitor = ServerHealthMonitor(args.monitor_interval, args.monitor_timeout)
+    if client.current_server:
+        monitor.add(client.current_server)
+    else:
+        print("🔍 Searching for GameMaster servers...")
+        for server in filter_servers(client.find_servers(), args.target):
+            monitor.add(server)
+    
+    def rediscover():
+        # Servers started after the monitor show up within a discovery round
+        while True:
+            time.sleep(30.0)
+            for server in filter_servers(client.find_servers(), args.target):
+                monitor.add(server)
+    
+    if not client.current_server:
+        threading.Thread(target=rediscover, daemon=True).start()
+    
+    interactive = sys.stdout.isatty()
+    try:
+        while True:
+            started = time.perf_counter()
+            monitor.probe_all()
+            table = monitor.render()
+            if interactive:
+                # Redraw in place instead of scrolling
+                sys.stdout.write("\033[H\033[J")
+                print(f"🩺 GameMaster servers, probing every {args.monitor_interval:g}s (Ctrl+C to stop)")
+                print(table)
+            else:
+                print(f"--- {time.strftime('%H:%M:%S')}")
+                print(table)
+            sys.stdout.flush()
+            time.sleep(max(0.0, args.monitor_interval - (time.perf_counter() - started)))
+    except KeyboardInterrupt:
+        print("\n👋 Goodbye!")
+    finally:
+        monitor.close()
+
+
+def parse_server_address(address: str) -> Dict[str, str]:
+    """Build server info from a "host[:port]" string"""
+    host, _, port = address.rpartition(':')
+    if not host:
+        host, port = port, ''
+    if not host:
+        raise ValueError(f"missing host in '{address}'")
+    if port and not (port.isdigit() and 1 <= int(port) <= 65535):
+        raise ValueError(f"port '{port}' in '{address}' is not a number from 1 to 65535")
+    
+    return {
+        'ip': host,
+        'port': int(port) if port else DEFAULT_SERVER_PORT,
+        'all_ips': [host],
+        'computer_name': host
+    }
+
+
+def server_address(value: str) -> str:
+    """Argument type of --server, rejects malformed addresses before the client is built"""
+    try:
+        parse_server_address(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return value
+
+
+def filter_servers(servers: List[Dict[str, str]], targets: Optional[List[str]]) -> List[Dict[str, str]]:
+    """Keep servers whose computer name or USN contains any of the targets (case-insensitive)"""
+    if not targets:
+        return servers
+    
+    patterns = [target.lower() for target in targets]
+    return [
+        server for server in servers
+        if any(pattern in server.get('computer_name', '').lower() or
+               pattern in server.get('usn', '').lower()
+               for pattern in patterns)
+    ]
+
+
+def run_batch(client: GameMasterClient, script: str, window: int, ordered: bool) -> bool:
+    """Run a command script (or stdin for "-") against the selected server"""
+    if not client.current_server and not client.select_server(interactive=False):
+        return False
+    
+    if script == '-':
+        return client.run_script(sys.stdin, window, ordered)
+    
+    with open(script, encoding='utf-8') as lines:
+        return client.run_script(lines, window, ordered)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="GameMaster Console Client")
+    parser.add_argument('--pool-size', type=int, default=4,
+                        help="Max keep-alive connections per server (default: 4)")
+    parser.add_argument('--retries', type=int, default=2,
+                        help="Connection retries per command (default: 2)")
+    parser.add_argument('--backoff', type=float, default=0.1,
+                        help="Retry backoff factor in seconds (default: 0.1)")
+    parser.add_argument('--quiet-period', type=float, default=0.5,
+                        help="Stop discovery once no new server answered for this many seconds "
+                             "(default: 0.5, 0 waits for the full search time)")
+    parser.add_argument('--first', type=int, default=None,
+                        help="Stop discovery as soon as this many servers are found")
+    parser.add_argument('--registry', action='store_true',
+                        help="Track servers from SSDP NOTIFY announcements in the background")
+    parser.add_argument('--no-ssdp-all', dest='search_all', action='store_false',
+                        help="Only search for the GameMaster service type, not ssdp:all")
+    parser.add_argument('--interface', dest='include_interfaces', action='append', metavar='NAME|IP',
+                        help="Only search on interfaces whose name or address matches, wildcards allowed "
+                             "(can be repeated, default: all but loopback)")
+    parser.add_argument('--exclude-interface', dest='exclude_interfaces', action='append', metavar='NAME|IP',
+                        help="Do not search on matching interfaces, e.g. 'docker*' (can be repeated)")
+    parser.add_argument('--ssdp-ttl', type=int, default=2,
+                        help="Multicast TTL of M-SEARCH requests (default: 2)")
+    parser.add_argument('--list-interfaces', action='store_true',
+                        help="Show the network interfaces and which ones discovery searches on, then exit")
+    parser.add_argument('--metrics-file', metavar='FILE',
+                        help="Append per-command timings to this file as JSON lines")
+    parser.add_argument('--cache-file', default=DEFAULT_CACHE_FILE,
+                        help=f"Where to remember last known servers (default: {DEFAULT_CACHE_FILE})")
+    parser.add_argument('--no-cache', dest='cache_file', action='store_const', const=None,
+                        help="Do not reconnect to or remember last known servers")
+    parser.add_argument('--stream', action='store_true',
+                        help="Send commands over the server's persistent command stream, HTTP if it has none")
+    parser.add_argument('--rate-limit', type=float, default=None, metavar='CMD_PER_S',
+                        help="Max commands per second sent to each server")
+    parser.add_argument('--burst', type=int, default=10,
+                        help="Commands that may be sent at once before --rate-limit applies (default: 10)")
+    parser.add_argument('--coalesce', action='append', type=coalesce_entry, metavar='CMD[:INDEX,...]',
+                        help="Merge waiting calls of an idempotent command that target the same thing, "
+                             "identified by the given argument indices ('*' for all arguments), can be repeated")
+    parser.add_argument('--server', type=server_address, metavar='HOST[:PORT]',
+                        help=f"Connect to this server without discovery (default port: {DEFAULT_SERVER_PORT})")
+    parser.add_argument('--script', metavar='FILE',
+                        help="Run commands from a script file ('-' for stdin) instead of the interactive console")
+    parser.add_argument('--window', type=int, default=8,
+                        help="Max commands in flight in script and replay mode (default: 8)")
+    parser.add_argument('--unordered', action='store_true',
+                        help="Report script results as they complete instead of in script order")
+    parser.add_argument('--broadcast', nargs=argparse.REMAINDER, metavar='CMD',
+                        help="Send one command to all discovered servers and exit, must be the last option")
+    parser.add_argument('--load-test', action='store_true',
+                        help="Stress-test the server with a command mix instead of the interactive console")
+    parser.add_argument('--load-command', action='append', metavar='[WEIGHT:]CMD ARGS',
+                        help="Command in the load test mix, can be repeated (default: help)")
+    parser.add_argument('--rate', type=float, default=None,
+                        help="Target commands per second for the load test (open loop)")
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help="Concurrent workers for the load test when no --rate is given (default: 1)")
+    parser.add_argument('--duration', type=float, default=10.0,
+                        help="Seconds per load test step (default: 10)")
+    parser.add_argument('--ramp-steps', type=int, default=1,
+                        help="Ramp the load up to the target in this many steps (default: 1)")
+    parser.add_argument('--max-in-flight', type=int, default=64,
+                        help="Max outstanding commands in --rate mode (default: 64)")
+    parser.add_argument('--monitor', action='store_true',
+                        help="Show a live health table of all servers instead of the interactive console")
+    parser.add_argument('--monitor-interval', type=float, default=0.5,
+                        help="Seconds between health probes in --monitor mode (default: 0.5)")
+    parser.add_argument('--monitor-timeout', type=float, default=0.5,
+                        help="Seconds before a health probe counts as failed (default: 0.5)")
+    parser.add_argument('--target', action='append', metavar='NAME',
+                        help="Limit --broadcast and --monitor to servers whose computer name or USN contains NAME "
+                             "(can be repeated)")
+    parser.add_argument('--max-lines', type=int, default=None,
+                        help="Print at most this many lines of a command's result data")
+    parser.add_argument('--page', action='store_true',
+                        help="Pause after every screen of result data")
+    parser.add_argument('--output', metavar='FILE',
+                        help="Write the raw JSON result of a one-shot command to FILE instead of printing it")
+    parser.add_argument('--record', metavar='FILE',
+                        help="Append every command sent, with its timing and outcome, to a session log")
+    parser.add_argument('--replay', metavar='FILE',
+                        help="Play a recorded session log back against the selected server")
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="Replay speed relative to the recording, 0 sends as fast as --window allows "
+                             "(default: 1)")
+    parser.add_argument('command', nargs=argparse.REMAINDER, metavar='CMD [ARGS ...]',
+                        help="Send one command and exit, with --server without any discovery")
+    return parser.parse_args(argv)
+
+
+def run_command(client: GameMasterClient, command: str, args: List[str],
+                output_file: Optional[str] = None) -> bool:
+    """Send a single command and report whether it succeeded"""
+    renderer = client.create_renderer(output_file)
+    if client.current_server:
+        # Server given on the command line: one plain HTTP request, nothing else to load
+        result = client.execute_once(command, args, renderer)
+    elif client.select_server(interactive=False):
+        result = client.execute_command(command, args, renderer=renderer)
+    else:
+        return False
+    
+    client.print_streamed_result(result, renderer)
+    client.metrics.close()
+    client.recorder.close()
+    return result.delivered and result.success
 
 
 def main():
     """Entry point for the application"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    args = parse_args()
+    # Looked up without importing it, startup does not pay for requests when it is installed
+    import importlib.util
+    if importlib.util.find_spec('requests') is None:
+        print("❌ The requests package is missing, install it with: pip install -r requirements.txt")
+        sys.exit(MISSING_DEPENDENCY_EXIT_CODE)
     try:
-        client = GameMasterClient()
+        # Every in-flight command needs its own keep-alive connection
+        pool_size = args.pool_size
+        if args.script or args.replay:
+            pool_size = max(pool_size, args.window)
+        if args.load_test:
+            pool_size = max(pool_size, args.max_in_flight if args.rate else args.concurrency)
+        client = GameMasterClient(pool_size=pool_size,
+                                  max_retries=args.retries,
+                                  backoff_factor=args.backoff,
+                                  quiet_period=args.quiet_period or None,
+                                  first_n=args.first,
+                                  use_registry=args.registry,
+                                  search_all=args.search_all,
+                                  metrics_file=args.metrics_file,
+                                  cache_file=args.cache_file,
+                                  max_lines=args.max_lines,
+                                  page=args.page,
+                                  record_file=args.record,
+                                  use_stream=args.stream,
+                                  rate_limit=args.rate_limit,
+                                  burst=args.burst,
+                                  coalesce=CommandCoalescer.parse_policy(args.coalesce),
+                                  multicast_ttl=args.ssdp_ttl,
+                                  include_interfaces=args.include_interfaces,
+                                  exclude_interfaces=args.exclude_interfaces)
+        if args.list_interfaces:
+            searched = client.ssdp_client.search_interfaces()
+            for name, ip in local_ipv4_interfaces():
+                marker = "🔍" if (name, ip) in searched else "  "
+                print(f"{marker} {name:<24} {ip}")
+            return
+        
+        if ((args.include_interfaces or args.exclude_interfaces) and not args.server
+                and not client.ssdp_client.search_interfaces()):
+            # Discovery would find nothing, forever
+            filters = [f"--interface {pattern}" for pattern in args.include_interfaces or []]
+            filters += [f"--exclude-interface {pattern}" for pattern in args.exclude_interfaces or []]
+            print(f"❌ No network interface is left by {' '.join(filters)}. Run with --list-interfaces to see them.")
+            sys.exit(1)
+        
+        if args.server:
+            client.connect(args.server)
+        
+        if args.command:
+            sys.exit(0 if run_command(client, args.command[0], args.command[1:], args.output) else 1)
+        
+        if args.script:
+            sys.exit(0 if run_batch(client, args.script, args.window, not args.unordered) else 1)
+        
+        if args.replay:
+            sys.exit(0 if run_replay(client, args) else 1)
+        
+        if args.load_test:
+            sys.exit(0 if run_load_test(client, args) else 1)
+        
+        if args.monitor:
+            run_monitor(client, args)
+            return
+        
+        if args.broadcast:
+            print("🔍 Searching for GameMaster servers...")
+            servers = filter_servers(client.find_servers(), args.target)
+            sys.exit(0 if client.run_broadcast(args.broadcast[0], args.broadcast[1:], servers) else 1)
+        
         client.run()
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
@@ -1,9 +1,17 @@
 @echo off
+rem Arguments are passed through, e.g. "run_client.bat --server 127.0.0.1 help" for a one-shot command
+if "%~1"=="" echo Starting GameMaster Console Client...
+python -m gamemaster_client %*
+
+rem The client checks its dependencies itself, pip takes seconds to start so it only runs when one is missing
+if not errorlevel 3 goto done
+if errorlevel 4 goto done
 echo Installing dependencies...
 pip install -r requirements.txt
-
 echo.
-echo Starting GameMaster Console Client...
-python gamemaster_client.py
+python -m gamemaster_client %*
 
-pause
+:done
+set status=%errorlevel%
+if "%~1"=="" pause
+exit /b %status%
@@ -1,8 +1,18 @@
 #!/bin/bash
 
-echo "Installing dependencies..."
-pip3 install -r requirements.txt
+# Arguments are passed through, e.g. "./run_client.sh --server 127.0.0.1 help" for a one-shot command
+if [ $# -eq 0 ]; then
+    echo "Starting GameMaster Console Client..."
+fi
+python3 -m gamemaster_client "$@"
+status=$?
 
-echo ""
-echo "Starting GameMaster Console Client..."
-python3 gamemaster_client.py
+# The client checks its dependencies itself, pip takes seconds to start so it only runs when one is missing
+if [ $status -eq 3 ]; then
+    echo "Installing dependencies..."
+    pip3 install -r requirements.txt
+    echo ""
+    python3 -m gamemaster_client "$@"
+    status=$?
+fi
+exit $status
@@ -6,6 +6,7 @@ This script can be used to test the SSDP discovery functionality
 without requiring a full interactive session.
 """
 
+import logging
 import sys
 import time
 from gamemaster_client import SSDPClient, GameMasterClient
@@ -60,6 +61,7 @@ def test_server_connection(server_ip: str, server_port: int):
 
 def main():
     """Main test function"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     print("🧪 GameMaster Console Client Test")
     print("=" * 50)
     
@@ -20,6 +20,9 @@ namespace GMConsole
     {
         private const string SetGameSpeedCommand = "SetGameSpeed";
         private const string HelpCommand = "help";
+        private const string CommandsVersionHeader = "X-GM-Commands-Version";
+        // The framed command stream listens next to the HTTP port
+        private const int StreamPortOffset = 1;
 
         private int _port;
         private bool _logRequests;
@@ -28,8 +31,12 @@ namespace GMConsole
         private CancellationTokenSource cancellationTokenSource;
         private bool isRunning = false;
         private GameMasterSsdpServer _ssdpServer;
+        private GameMasterStreamServer _streamServer;
         private readonly Dictionary<string, (string desc, Action<GMArgs> handler)> _registeredCommands;
         private SynchronizationContext _mainThreadSynchronizationContext;
+        // Identifies this run of the game, so clients never mistake a restarted server's commands for cached ones
+        private readonly string _instanceId = Guid.NewGuid().ToString("N");
+        private int _commandsRevision;
         
         public event Action<string, Dictionary<string, string>> OnCommandReceived;
         
@@ -53,7 +60,9 @@ namespace GMConsole
         /// <param name="allowNetworkAccess">Whether to allow connections from other computers on the network</param>
         /// <param name="logRequests">Whether to log incoming requests</param>
         /// <param name="enableSsdp">Whether to enable SSDP discovery service</param>
-        public void StartServer(int port = 54345, bool allowNetworkAccess = true, bool logRequests = true, bool enableSsdp = true)
+        /// <param name="enableStream">Whether to accept commands over a persistent TCP stream on port + 1</param>
+        public void StartServer(int port = 54345, bool allowNetworkAccess = true, bool logRequests = true, bool enableSsdp = true,
+            bool enableStream = true)
         {
             if (isRunning)
             {
@@ -122,6 +131,16 @@ namespace GMConsole
                 // Start listening for requests in background
                 Task.Run(() => ListenForRequests(cancellationTokenSource.Token));
                 
+                // Start the low-latency command stream, clients fall back to HTTP without it
+                if (enableStream)
+                {
+                    _streamServer = new GameMasterStreamServer(port + StreamPortOffset, allowNetworkAccess, _logRequests, DispatchStreamCommand);
+                    if (!_streamServer.StartServer())
+                    {
+                        _streamServer = null;
+                    }
+                }
+                
                 // Start SSDP discovery service if enabled
                 if (enableSsdp && allowNetworkAccess)
                 {
@@ -155,6 +174,9 @@ namespace GMConsole
                 _ssdpServer?.Dispose();
                 _ssdpServer = null;
                 
+                _streamServer?.Dispose();
+                _streamServer = null;
+                
                 cancellationTokenSource?.Cancel();
                 httpListener?.Stop();
                 httpListener?.Close();
@@ -186,17 +208,18 @@ namespace GMConsole
                 try
                 {
                     var context = await httpListener.GetContextAsync();
+                    var receivedAt = System.Diagnostics.Stopwatch.GetTimestamp();
                     
                     // Handle request on Unity main thread using captured synchronization context
                     if (_mainThreadSynchronizationContext != null)
                     {
-                        _mainThreadSynchronizationContext.Post(_ => HandleRequest(context), null);
+                        _mainThreadSynchronizationContext.Post(_ => HandleRequest(context, receivedAt), null);
                     }
                     else
                     {
                         // Fallback to current thread if no synchronization context is available
                         Debug.LogWarning("No synchronization context available, handling request on background thread");
-                        HandleRequest(context);
+                        HandleRequest(context, receivedAt);
                     }
                 }
                 catch (ObjectDisposedException)
@@ -224,7 +247,9 @@ namespace GMConsole
         /// <summary>
         /// Handles incoming HTTP requests
         /// </summary>
-        private void HandleRequest(HttpListenerContext context)
+        /// <param name="context">Request context</param>
+        /// <param name="receivedAt">Stopwatch timestamp when the listener thread accepted the request</param>
+        private void HandleRequest(HttpListenerContext context, long receivedAt)
         {
             var request = context.Request;
             var response = context.Response;
@@ -241,6 +266,9 @@ namespace GMConsole
                 response.Headers.Add("Access-Control-Allow-Methods", "GET, POST, OPTIONS");
                 response.Headers.Add("Access-Control-Allow-Headers", "Content-Type");
                 
+                // Lets clients invalidate their cached command list when commands are (un)registered
+                response.Headers.Add(CommandsVersionHeader, GetCommandsVersion());
+                
                 // Handle OPTIONS request for CORS preflight
                 if (request.HttpMethod == "OPTIONS")
                 {
@@ -251,7 +279,7 @@ namespace GMConsole
                 
                 if (request.HttpMethod == "POST" && request.Url.AbsolutePath == "/command")
                 {
-                    HandleCommandRequest(request, response);
+                    HandleCommandRequest(request, response, receivedAt);
                 }
                 else if (request.HttpMethod == "GET" && request.Url.AbsolutePath == "/")
                 {
@@ -287,8 +315,10 @@ namespace GMConsole
         /// <summary>
         /// Handles command execution requests
         /// </summary>
-        private void HandleCommandRequest(HttpListenerRequest request, HttpListenerResponse response)
+        private void HandleCommandRequest(HttpListenerRequest request, HttpListenerResponse response, long receivedAt)
         {
+            var dispatchedAt = System.Diagnostics.Stopwatch.GetTimestamp();
+            
             try
             {
                 // Read request body
@@ -321,7 +351,13 @@ namespace GMConsole
                 }
                 
                 // Execute command (placeholder for now)
+                var executeStartedAt = System.Diagnostics.Stopwatch.GetTimestamp();
                 var result = ExecuteCommand(commandData.Command, commandData.Arguments ?? new Dictionary<string, string>());
+                var executeFinishedAt = System.Diagnostics.Stopwatch.GetTimestamp();
+                
+                // Report where the time went: waiting for the main thread vs. running the handler
+                response.Headers.Add("X-GM-Queue-Ms", FormatMilliseconds(dispatchedAt - receivedAt));
+                response.Headers.Add("X-GM-Execute-Ms", FormatMilliseconds(executeFinishedAt - executeStartedAt));
                 
                 // Return response
                 response.StatusCode = 200;
@@ -340,6 +376,57 @@ namespace GMConsole
             }
         }
         
+        /// <summary>
+        /// Runs a command received on the stream on the Unity main thread, like HTTP requests
+        /// </summary>
+        private void DispatchStreamCommand(GameMasterStreamServer.StreamCommand command)
+        {
+            if (_mainThreadSynchronizationContext != null)
+            {
+                _mainThreadSynchronizationContext.Post(_ => HandleStreamCommand(command), null);
+            }
+            else
+            {
+                HandleStreamCommand(command);
+            }
+        }
+        
+        /// <summary>
+        /// Executes a stream command and replies with the result and the same timings as the HTTP headers
+        /// </summary>
+        private void HandleStreamCommand(GameMasterStreamServer.StreamCommand command)
+        {
+            var dispatchedAt = System.Diagnostics.Stopwatch.GetTimestamp();
+            
+            if (_logRequests)
+            {
+                Debug.Log($"Executing stream command: {command.Command} with {command.Arguments.Count} arguments");
+            }
+            
+            try
+            {
+                var executeStartedAt = System.Diagnostics.Stopwatch.GetTimestamp();
+                var result = ExecuteCommand(command.Command, command.Arguments);
+                var executeFinishedAt = System.Diagnostics.Stopwatch.GetTimestamp();
+                
+                command.Reply(new
+                {
+                    // Kept first, clients route a large answer by its Id before the rest has arrived
+                    Id = command.Id,
+                    result.Success,
+                    result.Message,
+                    result.Data,
+                    QueueMs = ToMilliseconds(dispatchedAt - command.ReceivedAt),
+                    ExecuteMs = ToMilliseconds(executeFinishedAt - executeStartedAt),
+                    CommandsVersion = GetCommandsVersion()
+                });
+            }
+            catch (Exception ex)
+            {
+                command.Reply(new { Id = command.Id, Error = $"Command execution failed: {ex.Message}" });
+            }
+        }
+        
         /// <summary>
         /// Handles status requests
         /// </summary>
@@ -351,11 +438,15 @@ namespace GMConsole
                 Port = _port,
                 Timestamp = DateTime.UtcNow.ToString("yyyy-MM-ddTHH:mm:ssZ"),
                 RegisteredCommands = GetRegisteredCommands(),
+                Commands = GetCommandDescriptions(),
+                CommandsVersion = GetCommandsVersion(),
+                StreamPort = _streamServer?.Port,
                 Endpoints = new[]
                 {
                     "GET / - Server status",
                     "POST /command - Execute command",
-                    "GET /description.xml - Service description (UPnP)"
+                    "GET /description.xml - Service description (UPnP)",
+                    "TCP StreamPort - Execute commands over length-prefixed JSON frames"
                 }
             };
             
@@ -532,6 +623,22 @@ namespace GMConsole
             return addresses;
         }
         
+        /// <summary>
+        /// Converts a Stopwatch tick interval to milliseconds for timing headers
+        /// </summary>
+        private static string FormatMilliseconds(long ticks)
+        {
+            return ToMilliseconds(ticks).ToString("F3", System.Globalization.CultureInfo.InvariantCulture);
+        }
+        
+        /// <summary>
+        /// Converts a Stopwatch tick interval to milliseconds
+        /// </summary>
+        private static double ToMilliseconds(long ticks)
+        {
+            return ticks * 1000.0 / System.Diagnostics.Stopwatch.Frequency;
+        }
+        
         /// <summary>
         /// Writes response data to the HTTP response
         /// </summary>
@@ -570,6 +677,7 @@ namespace GMConsole
             
             // Store command with original casing, dictionary will handle case-insensitive lookup
             _registeredCommands[command] = (description, handler);
+            Interlocked.Increment(ref _commandsRevision);
             
             if (_logRequests)
             {
@@ -594,6 +702,10 @@ namespace GMConsole
                 string.Equals(k, command, StringComparison.OrdinalIgnoreCase));
                 
             bool removed = actualKey != null && _registeredCommands.Remove(actualKey);
+            if (removed)
+            {
+                Interlocked.Increment(ref _commandsRevision);
+            }
             
             if (removed && _logRequests)
             {
@@ -627,6 +739,23 @@ namespace GMConsole
         {
             return _registeredCommands.Keys.ToArray();
         }
+        
+        /// <summary>
+        /// Gets descriptions of all registered commands
+        /// </summary>
+        /// <returns>Command descriptions by command name</returns>
+        private Dictionary<string, string> GetCommandDescriptions()
+        {
+            return _registeredCommands.ToDictionary(x => x.Key, x => x.Value.desc);
+        }
+        
+        /// <summary>
+        /// Gets a version that changes whenever the set of registered commands changes
+        /// </summary>
+        private string GetCommandsVersion()
+        {
+            return $"{_instanceId}.{Volatile.Read(ref _commandsRevision)}";
+        }
 
         private void HandleHelpCommand(GMArgs args) {
             args.SetResult("List of commands:\n" + string.Join('\n', _registeredCommands.Select(x => $"{x.Key} - {x.Value.desc}")));
@@ -0,0 +1,336 @@
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Net;
+using System.Net.Sockets;
+using System.Text;
+using System.Threading;
+using System.Threading.Tasks;
+using UnityEngine;
+using Newtonsoft.Json;
+
+namespace GMConsole
+{
+    /// <summary>
+    /// Long-lived TCP channel for game master commands, an alternative to one HTTP request per command.
+    /// Every frame is a 4-byte big-endian length followed by a UTF-8 JSON object. Requests carry an Id
+    /// that is echoed in the response, so a client can keep many commands in flight on one connection.
+    /// </summary>
+    public class GameMasterStreamServer : IDisposable
+    {
+        // Larger frames are treated as a broken client rather than buffered
+        private const int MaxFrameSize = 16 * 1024 * 1024;
+        
+        private readonly int _port;
+        private readonly bool _allowNetworkAccess;
+        private readonly bool _logRequests;
+        private readonly Action<StreamCommand> _dispatch;
+        
+        private TcpListener _listener;
+        private CancellationTokenSource _cancellationTokenSource;
+        private bool _isRunning;
+        
+        /// <summary>
+        /// Port the channel accepts connections on
+        /// </summary>
+        public int Port => _port;
+        
+        /// <summary>
+        /// Creates a new stream server
+        /// </summary>
+        /// <param name="port">Port to listen on</param>
+        /// <param name="allowNetworkAccess">Whether to allow connections from other computers on the network</param>
+        /// <param name="logRequests">Whether to log connections</param>
+        /// <param name="dispatch">Called on a background thread for every received command</param>
+        public GameMasterStreamServer(int port, bool allowNetworkAccess, bool logRequests, Action<StreamCommand> dispatch)
+        {
+            _port = port;
+            _allowNetworkAccess = allowNetworkAccess;
+            _logRequests = logRequests;
+            _dispatch = dispatch;
+        }
+        
+        /// <summary>
+        /// Starts accepting connections
+        /// </summary>
+        /// <returns>True if the server is listening</returns>
+        public bool StartServer()
+        {
+            if (_isRunning)
+            {
+                Debug.LogWarning("GameMasterStreamServer is already running");
+                return true;
+            }
+            
+            try
+            {
+                _listener = new TcpListener(_allowNetworkAccess ? IPAddress.Any : IPAddress.Loopback, _port);
+                _listener.Start();
+                
+                _cancellationTokenSource = new CancellationTokenSource();
+                _isRunning = true;
+                
+                Task.Run(() => AcceptConnections(_cancellationTokenSource.Token));
+                
+                Debug.Log($"GameMasterStreamServer started on port {_port}");
+                return true;
+            }
+            catch (Exception ex)
+            {
+                Debug.LogWarning($"Failed to start GameMasterStreamServer on port {_port}: {ex.Message}. " +
+                                 $"Clients will use HTTP only.");
+                _listener = null;
+                return false;
+            }
+        }
+        
+        /// <summary>
+        /// Stops the server and closes all connections
+        /// </summary>
+        public void StopServer()
+        {
+            if (!_isRunning)
+                return;
+            
+            try
+            {
+                _cancellationTokenSource?.Cancel();
+                _listener?.Stop();
+                _listener = null;
+                _isRunning = false;
+                
+                Debug.Log("GameMasterStreamServer stopped");
+            }
+            catch (Exception ex)
+            {
+                Debug.LogError($"Error stopping GameMasterStreamServer: {ex.Message}");
+            }
+        }
+        
+        /// <summary>
+        /// Disposes the stream server
+        /// </summary>
+        public void Dispose()
+        {
+            StopServer();
+            _cancellationTokenSource?.Dispose();
+        }
+        
+        /// <summary>
+        /// Accepts client connections until the server is stopped
+        /// </summary>
+        private async Task AcceptConnections(CancellationToken cancellationToken)
+        {
+            while (!cancellationToken.IsCancellationRequested)
+            {
+                try
+                {
+                    var client = await _listener.AcceptTcpClientAsync();
+                    // Commands are small, do not hold them back waiting for more data
+                    client.NoDelay = true;
+                    _ = Task.Run(() => HandleConnection(client, cancellationToken));
+                }
+                catch (ObjectDisposedException)
+                {
+                    // Expected when stopping the server
+                    break;
+                }
+                catch (SocketException) when (cancellationToken.IsCancellationRequested)
+                {
+                    break;
+                }
+                catch (Exception ex)
+                {
+                    Debug.LogError($"Unexpected error in GameMasterStreamServer: {ex.Message}");
+                    Debug.LogException(ex);
+                }
+            }
+        }
+        
+        /// <summary>
+        /// Reads request frames from one client and dispatches them until it disconnects
+        /// </summary>
+        private async Task HandleConnection(TcpClient client, CancellationToken cancellationToken)
+        {
+            var endpoint = client.Client.RemoteEndPoint;
+            if (_logRequests)
+            {
+                Debug.Log($"Stream client connected: {endpoint}");
+            }
+            
+            using (client)
+            using (var stream = client.GetStream())
+            using (cancellationToken.Register(() => client.Close()))
+            {
+                var connection = new StreamConnection(stream);
+                var header = new byte[4];
+                try
+                {
+                    while (!cancellationToken.IsCancellationRequested)
+                    {
+                        if (!await ReadExactly(stream, header, 4))
+                            break;
+                        
+                        int length = (header[0] << 24) | (header[1] << 16) | (header[2] << 8) | header[3];
+                        if (length < 0 || length > MaxFrameSize)
+                        {
+                            Debug.LogWarning($"Closing stream client {endpoint}: frame of {length} bytes");
+                            break;
+                        }
+                        
+                        var body = new byte[length];
+                        if (!await ReadExactly(stream, body, length))
+                            break;
+                        var receivedAt = System.Diagnostics.Stopwatch.GetTimestamp();
+                        
+                        StreamRequest request;
+                        try
+                        {
+                            request = JsonConvert.DeserializeObject<StreamRequest>(Encoding.UTF8.GetString(body));
+                        }
+                        catch (JsonException ex)
+                        {
+                            // Without an Id the client cannot match the answer, but it learns why it got none
+                            connection.Send(new { Id = (long?)null, Error = $"Invalid JSON: {ex.Message}" });
+                            continue;
+                        }
+                        
+                        if (string.IsNullOrEmpty(request?.Command))
+                        {
+                            connection.Send(new { Id = request?.Id, Error = "Command is required" });
+                            continue;
+                        }
+                        
+                        _dispatch(new StreamCommand(connection, request.Id, request.Command,
+                            request.Arguments ?? new Dictionary<string, string>(), receivedAt));
+                    }
+                }
+                catch (Exception ex) when (ex is IOException || ex is ObjectDisposedException || ex is SocketException)
+                {
+                    // Client went away mid-frame
+                }
+                finally
+                {
+                    connection.Close();
+                }
+            }
+            
+            if (_logRequests)
+            {
+                Debug.Log($"Stream client disconnected: {endpoint}");
+            }
+        }
+        
+        /// <summary>
+        /// Fills the buffer from the stream, returns false if the connection closed first
+        /// </summary>
+        private static async Task<bool> ReadExactly(NetworkStream stream, byte[] buffer, int count)
+        {
+            int offset = 0;
+            while (offset < count)
+            {
+                int read = await stream.ReadAsync(buffer, offset, count - offset);
+                if (read == 0)
+                    return false;
+                offset += read;
+            }
+            return true;
+        }
+        
+        /// <summary>
+        /// Writes response frames to one client, from whichever thread finished the command
+        /// </summary>
+        public class StreamConnection
+        {
+            private readonly NetworkStream _stream;
+            private readonly object _writeLock = new object();
+            private bool _closed;
+            
+            public StreamConnection(NetworkStream stream)
+            {
+                _stream = stream;
+            }
+            
+            /// <summary>
+            /// Serializes a response and sends it as one frame, dropping it if the client is gone
+            /// </summary>
+            public void Send(object response)
+            {
+                var body = Encoding.UTF8.GetBytes(JsonConvert.SerializeObject(response));
+                var frame = new byte[body.Length + 4];
+                frame[0] = (byte)(body.Length >> 24);
+                frame[1] = (byte)(body.Length >> 16);
+                frame[2] = (byte)(body.Length >> 8);
+                frame[3] = (byte)body.Length;
+                Buffer.BlockCopy(body, 0, frame, 4, body.Length);
+                
+                lock (_writeLock)
+                {
+                    if (_closed)
+                        return;
+                    try
+                    {
+                        _stream.Write(frame, 0, frame.Length);
+                    }
+                    catch (Exception ex) when (ex is IOException || ex is ObjectDisposedException)
+                    {
+                        _closed = true;
+                    }
+                }
+            }
+            
+            internal void Close()
+            {
+                lock (_writeLock)
+                {
+                    _closed = true;
+                }
+            }
+        }
+        
+        /// <summary>
+        /// A command received on the stream, answered with <see cref="Reply"/>
+        /// </summary>
+        public class StreamCommand
+        {
+            private readonly StreamConnection _connection;
+            
+            public long? Id { get; }
+            public string Command { get; }
+            public Dictionary<string, string> Arguments { get; }
+            /// <summary>
+            /// Stopwatch timestamp when the frame was read
+            /// </summary>
+            public long ReceivedAt { get; }
+            
+            public StreamCommand(StreamConnection connection, long? id, string command,
+                Dictionary<string, string> arguments, long receivedAt)
+            {
+                _connection = connection;
+                Id = id;
+                Command = command;
+                Arguments = arguments;
+                ReceivedAt = receivedAt;
+            }
+            
+            /// <summary>
+            /// Sends the response frame for this command
+            /// </summary>
+            public void Reply(object response)
+            {
+                _connection.Send(response);
+            }
+        }
+        
+        /// <summary>
+        /// Data structure for incoming stream requests
+        /// </summary>
+        [Serializable]
+        private class StreamRequest
+        {
+            public long? Id { get; set; }
+            public string Command { get; set; }
+            public Dictionary<string, string> Arguments { get; set; }
+        }
+    }
+}
@@ -6,7 +6,8 @@ namespace GMConsole
             int port = 54345, 
             bool allowNetworkAccess = true, 
             bool logRequests = true,
-            bool enableSsdp = true);
+            bool enableSsdp = true,
+            bool enableStream = true);
         void StopServer();
     }
 }
\ No newline at end of file